@@ -1,9 +1,74 @@
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))  # Add project root to Python path
+import uuid
 import streamlit as st
 from src.question.text_input import DataFetcher
-from src.question.multi_choice import CorrelationAnalysis, GarchAnalysis
+from src.question.multi_choice import (
+    CorrelationAnalysis, GarchAnalysis, RiskAnalysis
+)
+from src.question.alignment import US_EQUITIES
+from src.question.jobs import JobManager, report_progress
+
+
+@st.cache_resource
+def get_job_manager():
+    """Shared executor for background analysis jobs."""
+    return JobManager()
+
+
+def fetch_data(tickers, days):
+    """Background job: fetch price data for all tickers."""
+    dataframes = DataFetcher().get_data(tickers, days=days,
+                                        on_progress=report_progress)
+    if len(dataframes) != len(tickers):
+        raise LookupError("Unable to fetch data for all required tickers.")
+    return dataframes
+
+
+def run_correlation(dataframes, user_ticker, hedge_ticker):
+    """Background job: correlation analysis once the data is fetched."""
+    return CorrelationAnalysis().compute_correlation(
+        dataframes, user_ticker, hedge_ticker, calendar=US_EQUITIES,
+        on_progress=report_progress
+    )
+
+
+def run_volatility(dataframes, user_ticker, fit_garch):
+    """Background job: volatility analysis once the data is fetched."""
+    return GarchAnalysis().fit_volatility(
+        dataframes[user_ticker], fit_garch=fit_garch,
+        persistence_samples=100, on_progress=report_progress
+    )
+
+
+def run_risk(dataframes, volatility_result, user_ticker, hedge_ticker,
+             hedge_weight):
+    """Background job: VaR/ES simulation once the GARCH fit is done."""
+    return RiskAnalysis().compute_risk(
+        dataframes, volatility_result, user_ticker, hedge_ticker,
+        hedge_weight=hedge_weight, on_progress=report_progress
+    )
+
+
+@st.fragment(run_every="1s")
+def wait_for(job, message):
+    """Poll a running job and rerun the app once it has finished."""
+    if job.done():
+        st.rerun()
+    st.progress(job.progress, text=message)
+
+
+def show_job(job, message, render):
+    """Render a finished job's result, or wait for it to finish."""
+    if not job.done():
+        wait_for(job, message)
+        return
+    error = job.exception()
+    if error is None:
+        render(job.result())
+    else:
+        st.error(f"Analysis failed: {error}")
 
 
 def main():
@@ -13,9 +78,6 @@ def main():
         "Comparison with Hedging Instruments"
     )
 
-    # Initialize the data fetcher
-    data_fetcher = DataFetcher()
-
     # Sidebar for inputs
     st.sidebar.header("Parameters")
     user_ticker = st.sidebar.text_input(
@@ -36,89 +98,45 @@ def main():
     )
     hedge_color = "orange" if hedging_instrument == "Gold" else "gray"
 
+    # Range estimators give a quick read, GARCH fits are slower
+    fit_garch = st.sidebar.checkbox("Fit GARCH models", value=True)
+    hedge_weight = st.sidebar.slider(
+        "Hedge weight in risk portfolio:", 0.0, 1.0, 0.5
+    )
+
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = str(uuid.uuid4())
+    session_id = st.session_state.session_id
+    job_manager = get_job_manager()
+
     if st.sidebar.button("Analyze"):
         # Define tickers (user's stock and selected hedge)
         tickers = [user_ticker, hedge_ticker]
 
-        # Fetch data
-        dataframes = data_fetcher.get_data(tickers, days=days_lookback)
-
-        if dataframes and len(dataframes) == 2:
-            # Initialize Analysis Classes
-            correlation_analyzer = CorrelationAnalysis()
-            garch_analyzer = GarchAnalysis()
+        # Cancel superseded jobs, then fetch once and run both analyses
+        job_manager.new_request(session_id)
+        job_manager.submit(session_id, "fetch", fetch_data,
+                           tickers, days_lookback)
+        job_manager.submit(session_id, "correlation", run_correlation,
+                           user_ticker, hedge_ticker,
+                           depends_on=["fetch"])
+        job_manager.submit(session_id, "volatility", run_volatility,
+                           user_ticker, fit_garch,
+                           depends_on=["fetch"])
+        job_manager.submit(session_id, "risk", run_risk,
+                           user_ticker, hedge_ticker, hedge_weight,
+                           depends_on=["fetch", "volatility"])
+        st.session_state.request = {
+            "user_ticker": user_ticker,
+            "days_lookback": days_lookback,
+            "hedging_instrument": hedging_instrument,
+            "hedge_ticker": hedge_ticker,
+            "hedge_color": hedge_color,
+        }
 
-            # Display tabs for different analyses
-            tab1, tab2, tab3 = st.tabs(
-                ["Price Data", "Correlation Analysis", "Volatility Analysis"]
-            )
-
-            with tab1:
-                st.subheader("Price Data")
-                st.write(f"""
-                **Description:**
-                This tab displays the historical prices of **{user_ticker}**
-                and **{hedging_instrument}**
-                over the past **{days_lookback} days**.
-                It provides a clear comparison of how both assets performed,
-                helping to visually assess trends and patterns.
-                """)
-                correlation_analyzer.plot_dual_axis(
-                    dataframes, user_ticker, hedge_ticker, hedge_color
-                )
-
-            with tab2:
-                st.subheader(f"Correlation with {hedging_instrument}")
-                st.write(f"""
-                **Description:**
-                This tab explores the **log returns** of **{user_ticker}**
-                and **{hedging_instrument}** over
-                the past **{days_lookback} days**.
-                - **Log Returns Plot:** Shows how the returns fluctuate over
-                  time, giving insights into volatility.
-                - **Rolling Correlation:** Measures the dynamic relationship
-                  between the two assets over a rolling window.
-                  - A **positive correlation** indicates the assets move
-                    together, while a **negative correlation** suggests they
-                    move in opposite directions.
-                  - **Note:** Rolling correlation results often vary and may
-                    not provide a definitive relationship between
-                    **{user_ticker}** and **{hedging_instrument}**. It serves
-                    as a general indicator rather than a concrete conclusion.
-                """)
-                correlation_analyzer.analyze_correlation(
-                    dataframes, user_ticker, hedge_ticker, hedge_color
-                )
-
-            with tab3:
-                st.subheader("GARCH Volatility Analysis")
-                st.write(f"""
-                **Description:**
-                This tab focuses on **GARCH-based volatility modeling** for
-                **{user_ticker}**, using historical data from the past
-                **{days_lookback} days**. The analysis provides insights into
-                the stock's volatility dynamics, helping to evaluate the
-                **Volatility Clustering** and understanding how volatility
-                evolves over time in response to market conditions.
-                The value of p reflects the extent to which the model relies on
-                past shocks or sudden market changes to predict current
-                volatility, while q indicates the degree to which past
-                volatility levels affect the present. A model with lower
-                values of p and q (such as GARCH(1,1)) places greater emphasis
-                on the most recent market movements.
-                """)
-                garch_analyzer.analyze_volatility(dataframes[user_ticker])
-        else:
-            # Show the error message with a clickable link
-            st.error(
-                "Unable to fetch data for all required tickers. "
-                "Please ensure your inputs are correct and available at "
-                "[Polygon.io Tickers](https://polygon.io/quote/tickers)."
-            )
-            st.info(
-                "Please avoid querying the same ticker more than "
-                "once per minute to prevent API rate-limiting issues."
-            )
+    jobs = job_manager.jobs(session_id)
+    if jobs and "request" in st.session_state:
+        show_analysis(jobs, **st.session_state.request)
     else:
         # Default info message before analysis
         st.info(
@@ -127,5 +145,122 @@ def main():
         )
 
 
+def show_analysis(jobs, user_ticker, days_lookback, hedging_instrument,
+                  hedge_ticker, hedge_color):
+    """Display each tab as soon as its background job has finished."""
+    fetch_job = jobs["fetch"]
+    if fetch_job.done() and fetch_job.exception() is not None:
+        # Show the error message with a clickable link
+        st.error(
+            "Unable to fetch data for all required tickers. "
+            "Please ensure your inputs are correct and available at "
+            "[Polygon.io Tickers](https://polygon.io/quote/tickers)."
+        )
+        st.info(
+            "Please avoid querying the same ticker more than "
+            "once per minute to prevent API rate-limiting issues."
+        )
+        return
+
+    # Initialize Analysis Classes
+    correlation_analyzer = CorrelationAnalysis()
+    garch_analyzer = GarchAnalysis()
+    risk_analyzer = RiskAnalysis()
+
+    # Display tabs for different analyses
+    tab1, tab2, tab3, tab4 = st.tabs(
+        ["Price Data", "Correlation Analysis", "Volatility Analysis",
+         "Risk Analysis"]
+    )
+
+    with tab1:
+        st.subheader("Price Data")
+        st.write(f"""
+        **Description:**
+        This tab displays the historical prices of **{user_ticker}**
+        and **{hedging_instrument}**
+        over the past **{days_lookback} days**.
+        It provides a clear comparison of how both assets performed,
+        helping to visually assess trends and patterns.
+        """)
+        show_job(
+            fetch_job, "Fetching data...",
+            lambda dataframes: correlation_analyzer.plot_dual_axis(
+                dataframes, user_ticker, hedge_ticker, hedge_color
+            )
+        )
+
+    with tab2:
+        st.subheader(f"Correlation with {hedging_instrument}")
+        st.write(f"""
+        **Description:**
+        This tab explores the **log returns** of **{user_ticker}**
+        and **{hedging_instrument}** over
+        the past **{days_lookback} days**.
+        - **Log Returns Plot:** Shows how the returns fluctuate over
+          time, giving insights into volatility.
+        - **Rolling Correlation:** Measures the dynamic relationship
+          between the two assets over a rolling window.
+          - A **positive correlation** indicates the assets move
+            together, while a **negative correlation** suggests they
+            move in opposite directions.
+          - **Note:** Rolling correlation results often vary and may
+            not provide a definitive relationship between
+            **{user_ticker}** and **{hedging_instrument}**. It serves
+            as a general indicator rather than a concrete conclusion.
+        """)
+        show_job(
+            jobs["correlation"], "Computing correlation...",
+            lambda result: correlation_analyzer.render_correlation(
+                result, user_ticker, hedge_ticker, hedge_color
+            )
+        )
+
+    with tab3:
+        st.subheader("GARCH Volatility Analysis")
+        st.write(f"""
+        **Description:**
+        This tab focuses on **GARCH-based volatility modeling** for
+        **{user_ticker}**, using historical data from the past
+        **{days_lookback} days**. The analysis provides insights into
+        the stock's volatility dynamics, helping to evaluate the
+        **Volatility Clustering** and understanding how volatility
+        evolves over time in response to market conditions.
+        The value of p reflects the extent to which the model relies on
+        past shocks or sudden market changes to predict current
+        volatility, while q indicates the degree to which past
+        volatility levels affect the present. A model with lower
+        values of p and q (such as GARCH(1,1)) places greater emphasis
+        on the most recent market movements.
+        Realized and range-based estimators (Parkinson,
+        Garman-Klass, Rogers-Satchell, Yang-Zhang) are shown
+        alongside the GARCH curve for comparison.
+        """)
+        show_job(
+            jobs["volatility"], "Fitting GARCH models...",
+            garch_analyzer.render_volatility
+        )
+
+    with tab4:
+        st.subheader("Value-at-Risk and Expected Shortfall")
+        st.write(f"""
+        **Description:**
+        This tab simulates future returns of **{user_ticker}** from the
+        fitted GARCH model, and of a portfolio of **{user_ticker}** and
+        **{hedging_instrument}**, using filtered historical simulation
+        (resampling the models' standardized residuals together).
+        - **Value-at-Risk (VaR):** the loss that is exceeded in only 1%
+          of the simulated paths.
+        - **Expected Shortfall (ES):** the average loss in those worst
+          1% of paths.
+        """)
+        show_job(
+            jobs["risk"], "Simulating paths...",
+            lambda result: risk_analyzer.render_risk(
+                result, user_ticker, hedge_ticker
+            )
+        )
+
+
 if __name__ == "__main__":
     main()
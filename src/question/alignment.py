@@ -0,0 +1,225 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+def to_ns(timestamps):
+    """
+    Convert timestamps to int64 nanoseconds since the epoch (naive UTC).
+    """
+    # utc=True also accepts a mix of naive and tz-aware values
+    ts = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True))
+    ts = ts.tz_localize(None)
+    return ts.to_numpy().astype("datetime64[ns]").view(np.int64)
+
+
+def _lru_get(cache, lock, key, build, max_size):
+    """
+    Return cache[key], building it on a miss and evicting the least
+    recently used entries beyond max_size.
+    """
+    with lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        value = cache[key] = build()
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+        return value
+
+
+class SessionCalendar:
+    """
+    Trading-session calendar with a fixed daily open and close in a local
+    timezone. Session bounds and minute indices are cached per date range
+    (least recently used first out) so repeated alignments reuse the same
+    reference clock.
+    """
+    def __init__(self,
+                 tz="America/New_York",
+                 open_time="09:30",
+                 close_time="16:00",
+                 weekdays=(0, 1, 2, 3, 4),
+                 holidays=(),
+                 cache_size=8):
+        self.tz = tz
+        self.open_offset = pd.Timedelta(f"{open_time}:00")
+        self.close_offset = pd.Timedelta(f"{close_time}:00")
+        if self.close_offset <= self.open_offset:
+            raise ValueError("Session close must be after session open.")
+        self.weekdays = frozenset(weekdays)
+        self.holidays = frozenset(pd.Timestamp(d).normalize()
+                                  for d in holidays)
+        self.cache_size = cache_size
+        self._bounds_cache = OrderedDict()
+        self._index_cache = OrderedDict()
+        # Shared by the GUI and service threads; minute_index nests
+        # session_bounds, hence re-entrant
+        self._lock = threading.RLock()
+
+    def _date_range(self, start, end):
+        # Naive UTC days, whatever the timezone of start and end
+        start, end = pd.DatetimeIndex(to_ns([start, end]).astype(
+            "datetime64[ns]")).normalize()
+        return (start - pd.Timedelta(days=1), end + pd.Timedelta(days=1))
+
+    def session_bounds(self, start, end):
+        """
+        Return UTC open and close times (int64 ns) of every session
+        touching the period between start and end.
+        """
+        key = self._date_range(start, end)
+
+        def build():
+            dates = pd.date_range(*key, freq="D")
+            dates = dates[dates.weekday.isin(list(self.weekdays))]
+            dates = dates[~dates.isin(list(self.holidays))]
+            opens = (dates + self.open_offset).tz_localize(self.tz)
+            closes = (dates + self.close_offset).tz_localize(self.tz)
+            return to_ns(opens), to_ns(closes)
+
+        return _lru_get(self._bounds_cache, self._lock, key, build,
+                        self.cache_size)
+
+    def session_ids(self, timestamps):
+        """
+        Map each timestamp to its session, identified by the session's
+        UTC open time in nanoseconds, or -1 outside trading hours.
+        """
+        ts_ns = to_ns(timestamps)
+        if len(ts_ns) == 0:
+            return np.empty(0, dtype=np.int64)
+        opens, closes = self.session_bounds(
+            pd.Timestamp(ts_ns.min()), pd.Timestamp(ts_ns.max())
+        )
+        ids = np.searchsorted(opens, ts_ns, side="right") - 1
+        inside = (ids >= 0) & (ts_ns < closes[np.maximum(ids, 0)])
+        return np.where(inside, opens[np.maximum(ids, 0)], -1)
+
+    def minute_index(self, start, end, freq="1min"):
+        """
+        Build the reference clock: every bar start inside a trading session
+        between start and end. Whole days are cached and sliced, so
+        ranges starting at different times of the same days share one
+        index.
+        """
+        step = pd.Timedelta(freq).value
+        key = (*self._date_range(start, end), step)
+
+        def build():
+            opens, closes = self.session_bounds(start, end)
+            lengths = (closes - opens) // step
+            offsets = np.arange(lengths.sum()) - np.repeat(
+                np.cumsum(lengths) - lengths, lengths)
+            index_ns = np.repeat(opens, lengths) + offsets * step
+            return pd.DatetimeIndex(index_ns.astype("datetime64[ns]"))
+
+        index = _lru_get(self._index_cache, self._lock, key, build,
+                         self.cache_size)
+        lo, hi = to_ns([start, end])
+        index_ns = to_ns(index)
+        return index[np.searchsorted(index_ns, lo, side="left"):
+                     np.searchsorted(index_ns, hi, side="right")]
+
+
+US_EQUITIES = SessionCalendar()
+
+
+class AsOfAligner:
+    """
+    Align asynchronous series to a reference clock with vectorised as-of
+    lookups. Each reference time takes the last observation at or before
+    it, provided it is no older than `tolerance` and, when a calendar is
+    given, comes from the same trading session.
+    """
+    def __init__(self, reference, calendar=None, tolerance="5min"):
+        self.reference = pd.DatetimeIndex(reference)
+        self.calendar = calendar
+        self.tolerance = (None if tolerance is None
+                          else pd.Timedelta(tolerance).value)
+        self._ref_ns = to_ns(self.reference)
+        self._ref_sessions = (None if calendar is None
+                              else calendar.session_ids(self.reference))
+
+    @classmethod
+    def from_calendar(cls, calendar, start, end, freq="1min",
+                      tolerance="5min"):
+        """
+        Create an aligner whose reference clock is the calendar's
+        session minutes between start and end.
+        """
+        return cls(calendar.minute_index(start, end, freq),
+                   calendar=calendar, tolerance=tolerance)
+
+    def indexer(self, timestamps):
+        """
+        Return, for each reference time, the position of the matching
+        observation in `timestamps` (sorted), or -1 if there is none.
+        """
+        src_ns = to_ns(timestamps)
+        if len(src_ns) == 0:
+            return np.full(len(self._ref_ns), -1)
+
+        pos = np.searchsorted(src_ns, self._ref_ns, side="right") - 1
+        valid = pos >= 0
+        safe = np.maximum(pos, 0)
+        if self.tolerance is not None:
+            valid &= self._ref_ns - src_ns[safe] <= self.tolerance
+        if self.calendar is not None:
+            src_sessions = self.calendar.session_ids(timestamps)
+            valid &= src_sessions[safe] == self._ref_sessions
+            valid &= self._ref_sessions >= 0
+        return np.where(valid, pos, -1)
+
+    def align(self, data, column="Close"):
+        """
+        Return the values of `column` as-of each reference time,
+        NaN where no fresh observation exists.
+        """
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        pos = self.indexer(data.index)
+        values = data[column].to_numpy(dtype=np.float64)
+        out = np.full(len(pos), np.nan)
+        matched = pos >= 0
+        out[matched] = values[pos[matched]]
+        return out
+
+    def align_many(self, dataframes, column="Close"):
+        """
+        Align several tickers at once. Returns the ticker order and a
+        (tickers x reference) array of values.
+        """
+        tickers = list(dataframes)
+        out = np.full((len(tickers), len(self._ref_ns)), np.nan)
+        for row, ticker in enumerate(tickers):
+            out[row] = self.align(dataframes[ticker], column)
+        return tickers, out
+
+    def session_starts(self):
+        """
+        Boolean mask of reference times that start a new session: the
+        first time, every change of calendar session and, without a
+        calendar, every gap between reference times longer than the
+        tolerance.
+        """
+        starts = np.ones(len(self._ref_ns), dtype=bool)
+        if self._ref_sessions is not None:
+            starts[1:] = self._ref_sessions[1:] != self._ref_sessions[:-1]
+        elif self.tolerance is not None:
+            starts[1:] = np.diff(self._ref_ns) > self.tolerance
+        else:
+            starts[1:] = False
+        return starts
+
+    def log_returns(self, prices):
+        """
+        Log returns along the reference clock. The first bar of each
+        session is NaN so overnight gaps never count as one bar's return.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        returns = np.full(prices.shape, np.nan)
+        returns[..., 1:] = np.diff(np.log(prices), axis=-1)
+        returns[..., self.session_starts()] = np.nan
+        return returns
@@ -0,0 +1,241 @@
+import os
+import multiprocessing
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import warnings
+import numpy as np
+from arch import arch_model
+
+
+BootstrapInterval = namedtuple(
+    "BootstrapInterval", ["estimate", "lower", "upper", "replicates"]
+)
+
+# Upper bound on resampled values held in memory at once
+MAX_BATCH_VALUES = 5_000_000
+
+# Worker processes of the pool shared by all refit requests
+POOL_WORKERS = min(os.cpu_count() or 1, 4)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """
+    Return the process pool shared by all GARCH refits, created on first
+    use. Concurrent GUI sessions and service requests queue on the same
+    POOL_WORKERS processes instead of each starting their own. Workers
+    are spawned because callers run in threads, where forking can
+    deadlock.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def default_block_length(n):
+    """
+    Rule-of-thumb block length n^(1/3) for dependent data.
+    """
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def block_indices(n, n_boot, block_length, rng):
+    """
+    Circular moving-block bootstrap index matrix of shape (n_boot, n).
+    """
+    n_blocks = -(-n // block_length)
+    starts = rng.integers(0, n, size=(n_boot, n_blocks))
+    idx = starts[:, :, None] + np.arange(block_length)
+    return idx.reshape(n_boot, -1)[:, :n] % n
+
+
+def stationary_indices(n, n_boot, mean_block, rng):
+    """
+    Stationary (Politis-Romano) bootstrap index matrix of shape
+    (n_boot, n) with geometrically distributed block lengths.
+    """
+    positions = np.arange(n)
+    new_block = rng.random((n_boot, n)) < 1.0 / mean_block
+    new_block[:, 0] = True
+    # Position at which the current block started, per row
+    block_start = np.maximum.accumulate(
+        np.where(new_block, positions, 0), axis=1
+    )
+    starts = rng.integers(0, n, size=(n_boot, n))
+    rows = np.arange(n_boot)[:, None]
+    return (starts[rows, block_start] + positions - block_start) % n
+
+
+def resample_indices(n, n_boot, method="stationary", block_length=None,
+                     rng=None):
+    """
+    Build a bootstrap index matrix for the given method.
+    """
+    rng = np.random.default_rng(rng)
+    block_length = block_length or default_block_length(n)
+    if method == "stationary":
+        return stationary_indices(n, n_boot, block_length, rng)
+    if method == "block":
+        return block_indices(n, n_boot, block_length, rng)
+    raise ValueError(f"Unknown bootstrap method: {method}")
+
+
+def _rowwise_corr(x, y):
+    x = x - x.mean(axis=1, keepdims=True)
+    y = y - y.mean(axis=1, keepdims=True)
+    denom = np.sqrt((x * x).sum(axis=1) * (y * y).sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (x * y).sum(axis=1) / denom
+
+
+def _interval(estimate, replicates, alpha):
+    lower, upper = np.nanquantile(replicates, [alpha / 2, 1 - alpha / 2])
+    return BootstrapInterval(estimate, lower, upper, replicates)
+
+
+def bootstrap_correlation(x, y, n_boot=2000, method="stationary",
+                          block_length=None, alpha=0.05, seed=None,
+                          on_progress=None):
+    """
+    Percentile confidence interval for the Pearson correlation of two
+    aligned return series. Replicates are computed in batches of index
+    matrices so memory stays bounded for long minute series;
+    on_progress(fraction) is called after each batch.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x and y must be 1-D arrays of equal length.")
+    n = len(x)
+    if n < 3:
+        raise ValueError("At least 3 observations are needed.")
+
+    rng = np.random.default_rng(seed)
+    estimate = _rowwise_corr(x[None, :], y[None, :])[0]
+    batch = max(1, MAX_BATCH_VALUES // n)
+
+    replicates = np.empty(n_boot)
+    for start in range(0, n_boot, batch):
+        stop = min(start + batch, n_boot)
+        idx = resample_indices(n, stop - start, method, block_length, rng)
+        replicates[start:stop] = _rowwise_corr(x[idx], y[idx])
+        if on_progress is not None:
+            on_progress(stop / n_boot)
+
+    return _interval(estimate, replicates, alpha)
+
+
+def garch_persistence(params):
+    """
+    Persistence of a GARCH/GJR-GARCH model: sum of alpha and beta plus
+    half of gamma (symmetric innovations).
+    """
+    persistence = 0.0
+    for name, value in params.items():
+        if name.startswith(("alpha[", "beta[")):
+            persistence += value
+        elif name.startswith("gamma["):
+            persistence += 0.5 * value
+    return persistence
+
+
+def _fit_persistence_batch(log_ret, index_rows, spec, starting_values):
+    """
+    Refit the model on each resampled series, warm-started from the
+    original estimates. Runs inside a worker process.
+    """
+    out = np.full(len(index_rows), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for i, idx in enumerate(index_rows):
+            try:
+                fit = arch_model(log_ret[idx], **spec).fit(
+                    disp="off", starting_values=starting_values
+                )
+                out[i] = garch_persistence(fit.params)
+            except Exception:
+                pass
+    return out
+
+
+def bootstrap_garch_persistence(log_ret, p=1, q=1, o=0, dist="normal",
+                                n_boot=200, method="stationary",
+                                block_length=None, alpha=0.05, seed=None,
+                                n_jobs=None, params=None, chunk_size=10,
+                                on_progress=None):
+    """
+    Percentile confidence interval for GARCH persistence. Resampled
+    series are refitted in chunks of `chunk_size`, each fit warm-started
+    from the full-sample parameters: `params` of an existing fit of the
+    same specification, or a fresh fit if not given. By default chunks
+    run on the shared process pool; n_jobs=1 runs in-process and
+    n_jobs > 1 on a dedicated pool of that size. on_progress(fraction)
+    is called after each chunk; if it raises, pending chunks are
+    cancelled.
+    """
+    log_ret = np.asarray(log_ret, dtype=np.float64)
+    spec = {"vol": "Garch", "p": p, "q": q, "o": o, "dist": dist}
+
+    if params is None:
+        params = arch_model(log_ret, **spec).fit(disp="off").params
+    estimate = garch_persistence(params)
+    starting_values = params.to_numpy()
+
+    idx = resample_indices(len(log_ret), n_boot, method, block_length,
+                           np.random.default_rng(seed))
+    chunks = np.array_split(idx, -(-n_boot // chunk_size))
+
+    def report(done):
+        if on_progress is not None:
+            on_progress(done / len(chunks))
+
+    results = []
+    if n_jobs == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            results.append(_fit_persistence_batch(log_ret, chunk, spec,
+                                                  starting_values))
+            report(len(results))
+        return _interval(estimate, np.concatenate(results), alpha)
+
+    if n_jobs is None:
+        executor = shared_pool()
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=n_jobs,
+            mp_context=multiprocessing.get_context("spawn"))
+    futures = []
+    try:
+        futures = [executor.submit(_fit_persistence_batch, log_ret, chunk,
+                                   spec, starting_values)
+                   for chunk in chunks]
+        for future in futures:
+            results.append(future.result())
+            report(len(results))
+    except BrokenProcessPool:
+        if n_jobs is None:
+            _discard_pool(executor)
+        raise
+    finally:
+        # Drop queued chunks if the caller stopped early
+        for future in futures:
+            future.cancel()
+        if n_jobs is not None:
+            executor.shutdown(wait=True)
+
+    return _interval(estimate, np.concatenate(results), alpha)
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+
+# Series longer than this use the FFT for autocorrelations
+FFT_THRESHOLD = 512
+
+TESTS = ("jb", "lb", "lb2", "arch_lm", "sign_bias")
+
+
+def autocorrelation(x, nlags, fft=None):
+    """
+    Autocorrelations at lags 1..nlags for each row of a 2-D array.
+    Long series are handled with a zero-padded FFT, short ones with
+    direct lagged products.
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    n = x.shape[1]
+    x = x - x.mean(axis=1, keepdims=True)
+    if fft is None:
+        fft = n > FFT_THRESHOLD
+
+    if fft:
+        size = 1 << int(np.ceil(np.log2(2 * n - 1)))
+        spectrum = np.fft.rfft(x, n=size, axis=1)
+        acov = np.fft.irfft(spectrum * spectrum.conj(), n=size, axis=1)
+        acov = acov[:, :nlags + 1]
+    else:
+        acov = np.empty((x.shape[0], nlags + 1))
+        acov[:, 0] = (x * x).sum(axis=1)
+        for k in range(1, nlags + 1):
+            acov[:, k] = (x[:, k:] * x[:, :-k]).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return acov[:, 1:] / acov[:, :1]
+
+
+def jarque_bera(z):
+    """
+    Row-wise Jarque-Bera statistics and p-values.
+    """
+    n = z.shape[1]
+    centered = z - z.mean(axis=1, keepdims=True)
+    m2 = (centered ** 2).mean(axis=1)
+    skew = (centered ** 3).mean(axis=1) / m2 ** 1.5
+    kurt = (centered ** 4).mean(axis=1) / m2 ** 2
+    stat = n / 6.0 * (skew ** 2 + (kurt - 3.0) ** 2 / 4.0)
+    return stat, chi2.sf(stat, 2)
+
+
+def ljung_box(rho, n):
+    """
+    Row-wise Ljung-Box statistics and p-values from autocorrelations
+    at lags 1..L.
+    """
+    lags = rho.shape[1]
+    stat = n * (n + 2) * (rho ** 2 / (n - np.arange(1, lags + 1))).sum(axis=1)
+    return stat, chi2.sf(stat, lags)
+
+
+def _lm_test(y, X):
+    """
+    Batched auxiliary regressions of y (C x m) on a constant and
+    X (C x m x k). Returns m * R^2 and its chi-square p-value.
+    """
+    count, m, k = X.shape
+    X = np.concatenate([np.ones((count, m, 1)), X], axis=2)
+    xtx = np.einsum("cmi,cmj->cij", X, X)
+    xty = np.einsum("cmi,cm->ci", X, y)
+    beta = np.linalg.solve(xtx, xty[:, :, None])[:, :, 0]
+    resid = y - np.einsum("cmi,ci->cm", X, beta)
+    centered = y - y.mean(axis=1, keepdims=True)
+    r2 = 1.0 - (resid ** 2).sum(axis=1) / (centered ** 2).sum(axis=1)
+    stat = m * r2
+    return stat, chi2.sf(stat, k)
+
+
+def arch_lm(z, nlags):
+    """
+    Row-wise Engle ARCH-LM test: squared residuals on their own lags.
+    """
+    sq = z ** 2
+    lagged = np.lib.stride_tricks.sliding_window_view(
+        sq[:, :-1], nlags, axis=1)
+    return _lm_test(sq[:, nlags:], lagged[:, :, ::-1])
+
+
+def sign_bias(z):
+    """
+    Row-wise Engle-Ng joint sign and size bias test.
+    """
+    prev = z[:, :-1]
+    negative = (prev < 0).astype(np.float64)
+    X = np.stack([negative, negative * prev, (1.0 - negative) * prev],
+                 axis=2)
+    return _lm_test(z[:, 1:] ** 2, X)
+
+
+def standardized_residuals(fits):
+    """
+    Stack standardized residuals of several fits into one array, keeping
+    only observations that are valid for every fit.
+    """
+    resid = np.vstack([np.asarray(fit.resid, dtype=np.float64)
+                       for fit in fits])
+    vol = np.vstack([np.asarray(fit.conditional_volatility,
+                                dtype=np.float64) for fit in fits])
+    valid = (np.isfinite(resid) & np.isfinite(vol) & (vol > 0)).all(axis=0)
+    return resid[:, valid] / vol[:, valid]
+
+
+def run_diagnostics(z, names, nlags=10):
+    """
+    Compute all residual diagnostics for every candidate at once.
+    `z` holds one row of standardized residuals per candidate.
+    """
+    z = np.atleast_2d(np.asarray(z, dtype=np.float64))
+    n = z.shape[1]
+    nlags = min(nlags, max(1, n // 4))
+
+    rho = autocorrelation(np.vstack([z, z ** 2]), nlags)
+    columns = {}
+    for test, (stat, pvalue) in zip(TESTS, (
+            jarque_bera(z),
+            ljung_box(rho[:len(z)], n),
+            ljung_box(rho[len(z):], n),
+            arch_lm(z, nlags),
+            sign_bias(z))):
+        columns[f"{test}_stat"] = stat
+        columns[f"{test}_pvalue"] = pvalue
+    return pd.DataFrame(columns, index=list(names))
+
+
+class SelectionRule:
+    """
+    Choose a model by information criterion among candidates whose
+    residuals pass the required diagnostics at level alpha. When no
+    candidate passes, fall back to the criterion alone.
+    """
+    def __init__(self, criterion="bic", alpha=0.05,
+                 require=("lb", "lb2", "arch_lm")):
+        unknown = set(require) - set(TESTS)
+        if unknown:
+            raise ValueError(f"Unknown diagnostics: {sorted(unknown)}")
+        self.criterion = criterion
+        self.alpha = alpha
+        self.require = tuple(require)
+
+    def passes(self, table):
+        """
+        Boolean Series: candidates passing every required test.
+        """
+        passed = np.ones(len(table), dtype=bool)
+        for test in self.require:
+            passed &= table[f"{test}_pvalue"].to_numpy() > self.alpha
+        return pd.Series(passed, index=table.index)
+
+    def select(self, table, criteria):
+        """
+        Return the name of the chosen candidate. `criteria` maps
+        candidate names to their information criterion values.
+        """
+        scores = pd.Series(criteria, dtype=np.float64).reindex(table.index)
+        eligible = scores[self.passes(table)]
+        if eligible.empty:
+            eligible = scores
+        return eligible.idxmin()
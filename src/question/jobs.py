@@ -0,0 +1,196 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """Raised inside a job that was superseded by a newer request."""
+
+
+_current = threading.local()
+
+
+def current_job():
+    """
+    Return the job running in this thread, or None outside a job.
+    """
+    return getattr(_current, "job", None)
+
+
+def report_progress(fraction):
+    """
+    Record progress of the current job. Also a cancellation point:
+    raises JobCancelled if the job has been superseded.
+    """
+    job = current_job()
+    if job is None:
+        return
+    job.progress = fraction
+    if job.cancelled:
+        raise JobCancelled(job.name)
+
+
+class Job:
+    """
+    Handle to a background job: a future plus progress and a
+    cooperative cancellation flag.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.future = Future()
+        self.progress = 0.0
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        Cancel the job. A pending job never starts, a running job stops
+        at its next report_progress call.
+        """
+        self._cancel_event.set()
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def exception(self, timeout=None):
+        if self.future.cancelled():
+            return JobCancelled(self.name)
+        return self.future.exception(timeout)
+
+
+class JobManager:
+    """
+    Run jobs on a shared thread pool with a dependency graph per session.
+    A job starts once all its dependencies have finished and receives
+    their results as leading positional arguments. Starting a new request
+    for a session cancels that session's previous jobs. Sessions idle for
+    `session_ttl` seconds, or beyond the `max_sessions` most recently
+    used, are dropped with their jobs so finished results do not live
+    for the life of the process.
+    """
+    def __init__(self, max_workers=4, max_sessions=32, session_ttl=1800):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        # session id -> (last access time, jobs by name), oldest first
+        self._sessions = OrderedDict()
+
+    def _touch(self, session_id):
+        """
+        Mark the session as used and evict expired or surplus sessions.
+        Must be called with the lock held.
+        """
+        now = time.monotonic()
+        _, session = self._sessions.pop(session_id, (None, {}))
+        self._sessions[session_id] = (now, session)
+
+        evicted = []
+        while self._sessions:
+            oldest_id, (last_used, _) = next(iter(self._sessions.items()))
+            if (len(self._sessions) <= self.max_sessions
+                    and now - last_used <= self.session_ttl):
+                break
+            evicted.append(self._sessions.pop(oldest_id)[1])
+        return session, evicted
+
+    def _cancel(self, sessions):
+        for session in sessions:
+            for job in session.values():
+                job.cancel()
+
+    def jobs(self, session_id):
+        """
+        Return the current jobs of a session, keyed by name.
+        """
+        with self._lock:
+            if session_id not in self._sessions:
+                return {}
+            session, evicted = self._touch(session_id)
+            session = dict(session)
+        self._cancel(evicted)
+        return session
+
+    def new_request(self, session_id):
+        """
+        Cancel any in-flight jobs of the session and start an empty
+        job set for the new request.
+        """
+        with self._lock:
+            previous, evicted = self._touch(session_id)
+            self._sessions[session_id] = (time.monotonic(), {})
+        self._cancel([previous, *evicted])
+
+    def release(self, session_id):
+        """
+        Cancel and forget all jobs of a session.
+        """
+        with self._lock:
+            _, session = self._sessions.pop(session_id, (None, {}))
+        self._cancel([session])
+
+    def submit(self, session_id, name, fn, *args, depends_on=(), **kwargs):
+        """
+        Schedule fn(*dependency_results, *args, **kwargs) as job `name`
+        once the named dependencies of the same session have finished.
+        """
+        job = Job(name)
+        with self._lock:
+            session, evicted = self._touch(session_id)
+            deps = [session[dep] for dep in depends_on]
+            session[name] = job
+        self._cancel(evicted)
+
+        if not deps:
+            self._start(job, fn, deps, args, kwargs)
+            return job
+
+        remaining = [len(deps)]
+
+        def on_dependency_done(_):
+            with self._lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                self._start(job, fn, deps, args, kwargs)
+
+        for dep in deps:
+            dep.future.add_done_callback(on_dependency_done)
+        return job
+
+    def _start(self, job, fn, deps, args, kwargs):
+        for dep in deps:
+            error = dep.exception()
+            if error is not None:
+                # Propagate failures and cancellations down the graph
+                if job.future.set_running_or_notify_cancel():
+                    job.future.set_exception(error)
+                return
+        if job.cancelled:
+            job.future.cancel()
+            return
+        self._executor.submit(
+            self._run, job, fn, [dep.result() for dep in deps], args, kwargs
+        )
+
+    def _run(self, job, fn, dep_results, args, kwargs):
+        if not job.future.set_running_or_notify_cancel():
+            return
+        _current.job = job
+        try:
+            job.future.set_result(fn(*dep_results, *args, **kwargs))
+        except Exception as e:
+            job.future.set_exception(e)
+        finally:
+            _current.job = None
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
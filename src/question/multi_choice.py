@@ -2,10 +2,22 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
 from src.base import BaseAnalysis
+from src.question.volatility_estimators import (
+    estimate_volatility, session_days
+)
+from src.question.alignment import AsOfAligner, US_EQUITIES
+from src.question.bootstrap import (
+    bootstrap_correlation, bootstrap_garch_persistence
+)
+from src.question.simulation import (
+    spec_from_fit, simulate_returns, portfolio_returns, value_at_risk
+)
+from src.question.diagnostics import (
+    SelectionRule, run_diagnostics, standardized_residuals
+)
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import jarque_bera
 from arch import arch_model
 import streamlit as st
 
@@ -57,51 +69,63 @@ class CorrelationAnalysis(BaseAnalysis):
 
         st.pyplot(fig)
 
-    def analyze_correlation(self,
+    def compute_correlation(self,
                             dataframes,
                             user_ticker,
                             hedge_ticker,
-                            hedge_color,
-                            rolling_window=30):
+                            rolling_window=30,
+                            calendar=US_EQUITIES,
+                            tolerance="5min",
+                            bootstrap_samples=1000,
+                            on_progress=None):
         """
-        Analyze the correlation between a user's stock
-        ticker and hedging instrument.
+        Align the stock and hedging instrument on the calendar's session
+        minutes (or, with calendar=None, the stock's own bars) and compute
+        their log returns, correlation, bootstrap interval and rolling
+        correlation.
+        on_progress(fraction) follows the bootstrap batches.
         """
-        if user_ticker not in dataframes or dataframes[user_ticker].empty:
-            st.error(f"No data available for {user_ticker}.")
-            return
-
-        if hedge_ticker not in dataframes or dataframes[hedge_ticker].empty:
-            st.error(f"No data available for {hedge_ticker}.")
-            return
+        # Align Timestamps: as-of lookups on the stock's trading sessions
+        stock_index = dataframes[user_ticker].index.sort_values()
+        if calendar is not None:
+            aligner = AsOfAligner.from_calendar(
+                calendar, stock_index[0], stock_index[-1],
+                tolerance=tolerance
+            )
+        else:
+            aligner = AsOfAligner(stock_index, tolerance=tolerance)
 
-        # Align Timestamps
-        aligned_data = pd.merge(
-            dataframes[user_ticker],
-            dataframes[hedge_ticker],
-            left_index=True,
-            right_index=True,
-            suffixes=(f'_{user_ticker}', f'_{hedge_ticker}')
+        tickers = [user_ticker, hedge_ticker]
+        _, prices = aligner.align_many(
+            {ticker: dataframes[ticker] for ticker in tickers}
         )
 
-        # Compute Log Returns
-        aligned_data[f'Log_Returns_{user_ticker}'] = np.log(
-            aligned_data[f'Close_{user_ticker}']
-            / aligned_data[f'Close_{user_ticker}'].shift(1)
-        )
-        aligned_data[f'Log_Returns_{hedge_ticker}'] = np.log(
-            aligned_data[f'Close_{hedge_ticker}']
-            / aligned_data[f'Close_{hedge_ticker}'].shift(1)
-        )
+        # Compute Log Returns (NaN at the start of each session)
+        log_returns = aligner.log_returns(prices)
 
-        # Drop NaN values created by the shift
+        aligned_data = pd.DataFrame(index=aligner.reference)
+        for row, ticker in enumerate(tickers):
+            aligned_data[f'Close_{ticker}'] = prices[row]
+            aligned_data[f'Log_Returns_{ticker}'] = log_returns[row]
+
+        # Drop bars without a fresh price or a same-session return
         aligned_data.dropna(inplace=True)
 
         # Correlation Analysis
         correlation = aligned_data[f'Log_Returns_{user_ticker}'].corr(
             aligned_data[f'Log_Returns_{hedge_ticker}']
         )
-        st.metric(f"Correlation with {hedge_ticker}", f"{correlation:.4f}")
+
+        # Bootstrap confidence interval
+        interval = None
+        if bootstrap_samples and len(aligned_data) > 2:
+            interval = bootstrap_correlation(
+                aligned_data[f'Log_Returns_{user_ticker}'],
+                aligned_data[f'Log_Returns_{hedge_ticker}'],
+                n_boot=bootstrap_samples,
+                seed=0,
+                on_progress=on_progress
+            )
 
         # Rolling Correlation
         rolling_corr = aligned_data[
@@ -109,6 +133,61 @@ class CorrelationAnalysis(BaseAnalysis):
             aligned_data[f'Log_Returns_{hedge_ticker}']
         )
 
+        return {
+            'aligned_data': aligned_data,
+            'correlation': correlation,
+            'interval': interval,
+            'rolling_corr': rolling_corr,
+            'rolling_window': rolling_window,
+        }
+
+    def analyze_correlation(self,
+                            dataframes,
+                            user_ticker,
+                            hedge_ticker,
+                            hedge_color,
+                            rolling_window=30,
+                            calendar=US_EQUITIES,
+                            tolerance="5min",
+                            bootstrap_samples=1000):
+        """
+        Analyze the correlation between a user's stock
+        ticker and hedging instrument.
+        """
+        if user_ticker not in dataframes or dataframes[user_ticker].empty:
+            st.error(f"No data available for {user_ticker}.")
+            return
+
+        if hedge_ticker not in dataframes or dataframes[hedge_ticker].empty:
+            st.error(f"No data available for {hedge_ticker}.")
+            return
+
+        result = self.compute_correlation(
+            dataframes, user_ticker, hedge_ticker, rolling_window,
+            calendar, tolerance, bootstrap_samples
+        )
+        self.render_correlation(result, user_ticker, hedge_ticker,
+                                hedge_color)
+
+    def render_correlation(self, result, user_ticker, hedge_ticker,
+                           hedge_color):
+        """
+        Display the output of compute_correlation.
+        """
+        aligned_data = result['aligned_data']
+        rolling_corr = result['rolling_corr']
+        rolling_window = result['rolling_window']
+        interval = result['interval']
+
+        st.metric(f"Correlation with {hedge_ticker}",
+                  f"{result['correlation']:.4f}")
+        if interval is not None:
+            st.caption(
+                f"95% confidence interval: [{interval.lower:.4f}, "
+                f"{interval.upper:.4f}] (stationary bootstrap, "
+                f"{len(interval.replicates)} samples)"
+            )
+
         # Plot Log Returns
         fig1, ax1 = plt.subplots(figsize=(12, 6))
         ax1.plot(
@@ -155,34 +234,44 @@ class GarchAnalysis(BaseAnalysis):
     def __init__(self):
         super().__init__()
 
-    def preprocess_log_returns(self, log_ret, scale_threshold=1e-3):
+    def scale_log_returns(self, log_ret, scale_threshold=1e-3):
         """
-        Preprocess log returns to check and apply scaling if necessary.
+        Scale log returns by 1000 when their mean is below the threshold.
         """
-        scale_factor = 1  # Default to no scaling
-
         if abs(log_ret.mean()) < scale_threshold:
-            scale_factor = 1000
-            log_ret = log_ret * scale_factor
-            st.info(
-                f"Log returns scaled by a factor of {scale_factor} "
-                f"for better optimization."
-            )
-        else:
-            st.info("Log returns are well-scaled. No scaling applied.")
+            return log_ret * 1000, 1000
+        return log_ret, 1
 
+    def scaling_message(self, scale_factor):
+        """
+        Describe the scaling applied to the log returns.
+        """
+        if scale_factor != 1:
+            return (f"Log returns scaled by a factor of {scale_factor} "
+                    f"for better optimization.")
+        return "Log returns are well-scaled. No scaling applied."
+
+    def preprocess_log_returns(self, log_ret, scale_threshold=1e-3):
+        """
+        Preprocess log returns to check and apply scaling if necessary.
+        """
+        log_ret, scale_factor = self.scale_log_returns(log_ret,
+                                                       scale_threshold)
+        st.info(self.scaling_message(scale_factor))
         return log_ret, scale_factor
 
-    def find_best_garch_params(self, log_ret):
+    def search_garch_params(self, log_ret, on_progress=None):
         """
-        Determine the best p and q parameters for
-        a GARCH model based on the lowest BIC.
+        Fit GARCH(p, q) for p, q in 1..3 and return the orders with the
+        lowest BIC, that BIC, a list of (p, q, error) for failed fits and
+        a dict of the successful fits keyed by (p, q).
         """
         p_max, q_max = 3, 3
         best_p, best_q = 0, 0
         lowest_bic = np.inf
+        errors = []
+        fits = {}
 
-        progress_bar = st.progress(0)
         total_iterations = p_max * q_max
         current_iteration = 0
 
@@ -195,62 +284,120 @@ class GarchAnalysis(BaseAnalysis):
                                        q=q,
                                        dist='normal')
                     fit = model.fit(disp='off')
+                    fits[(p, q)] = fit
                     if fit.bic < lowest_bic:
                         lowest_bic = fit.bic
                         best_p, best_q = p, q
                 except Exception as e:
-                    st.warning(
-                        f"Error fitting model with p={p}, q={q}: {e}"
-                    )
+                    errors.append((p, q, e))
 
                 current_iteration += 1
-                progress_bar.progress(current_iteration / total_iterations)
+                if on_progress is not None:
+                    on_progress(current_iteration / total_iterations)
 
-        st.success(
-            f"Best GARCH parameters: p={best_p}, q={best_q} "
-            f"with BIC={lowest_bic:.2f}"
+        return best_p, best_q, lowest_bic, errors, fits
+
+    def find_best_garch_params(self, log_ret):
+        """
+        Determine the best p and q parameters for
+        a GARCH model based on the lowest BIC.
+        """
+        progress_bar = st.progress(0)
+        best_p, best_q, lowest_bic, errors, _ = self.search_garch_params(
+            log_ret, on_progress=progress_bar.progress
         )
+        self.show_search_messages(best_p, best_q, lowest_bic, errors)
         return best_p, best_q
 
+    def show_search_messages(self, best_p, best_q, lowest_bic, errors,
+                             selected_model=None):
+        """
+        Display failed fits and the chosen GARCH orders. When the
+        diagnostics picked the final model, the search result is shown as
+        the lowest-BIC candidate next to the selected model instead.
+        """
+        for p, q, e in errors:
+            st.warning(f"Error fitting model with p={p}, q={q}: {e}")
+        if selected_model is None:
+            st.success(
+                f"Best GARCH parameters: p={best_p}, q={best_q} "
+                f"with BIC={lowest_bic:.2f}"
+            )
+            return
+        st.info(
+            f"Lowest BIC in the order search: GARCH({best_p}, {best_q}) "
+            f"with BIC={lowest_bic:.2f}"
+        )
+        st.success(f"Selected model: {selected_model}")
+
     def compare_models_and_pick_best(self, log_ret, best_p, best_q):
         """
         Fit GARCH and GJR-GARCH models, compare their BICs,
         and pick the best model.
         """
         with st.spinner('Fitting GARCH models...'):
-            fit_garch = arch_model(log_ret, vol="Garch",
-                                   p=best_p,
-                                   q=best_q,
-                                   dist="normal").fit(disp="off")
-            garch_bic = fit_garch.bic
-
-            residuals = fit_garch.resid
-            conditional_volatility = fit_garch.conditional_volatility
-            valid_indices = (
-                (~np.isnan(residuals)) &
-                (~np.isnan(conditional_volatility)) &
-                (conditional_volatility > 0)
-            )
-            standardized_residuals = residuals[
-                valid_indices] / conditional_volatility[valid_indices]
-
-            jb_stat, jb_pvalue = jarque_bera(standardized_residuals)
-
-            if jb_pvalue < 0.05:
-                fit_gjr_garch = arch_model(log_ret,
-                                           vol="Garch",
-                                           p=best_p,
-                                           q=best_q,
-                                           o=1,
-                                           dist="t").fit(disp="off")
-                gjr_garch_bic = fit_gjr_garch.bic
-                best_model = (
-                    fit_gjr_garch if gjr_garch_bic < garch_bic else fit_garch
-                )
-            else:
-                best_model = fit_garch
-
-        return best_model
+            return self.fit_best_model(log_ret, best_p, best_q)
+
+    def fit_best_model(self, log_ret, best_p, best_q, fits=None, rule=None):
+        """
+        Fit GARCH and, when residuals are not normal, GJR-GARCH with
+        Student's t innovations, and return the model chosen by `rule`.
+        """
+        return self.select_best_model(log_ret, best_p, best_q, fits, rule)[1]
+
+    def select_best_model(self, log_ret, best_p, best_q, fits=None,
+                          rule=None):
+        """
+        Run residual diagnostics on every candidate fit and pick one with
+        the selection rule. Fits from the parameter search are reused.
+        Returns the chosen name, the chosen fit and the diagnostics table.
+        """
+        rule = rule or SelectionRule()
+        candidates = {
+            f"GARCH({p}, {q})": fit for (p, q), fit in (fits or {}).items()
+        }
+        garch_name = f"GARCH({best_p}, {best_q})"
+        if garch_name not in candidates:
+            candidates[garch_name] = arch_model(log_ret, vol="Garch",
+                                                p=best_p,
+                                                q=best_q,
+                                                dist="normal").fit(disp="off")
+
+        table = run_diagnostics(
+            standardized_residuals(candidates.values()), candidates
+        )
+
+        if table.loc[garch_name, 'jb_pvalue'] < 0.05:
+            gjr_name = f"GJR-GARCH({best_p}, {best_q})"
+            candidates[gjr_name] = arch_model(log_ret,
+                                              vol="Garch",
+                                              p=best_p,
+                                              q=best_q,
+                                              o=1,
+                                              dist="t").fit(disp="off")
+            table = pd.concat([table, run_diagnostics(
+                standardized_residuals([candidates[gjr_name]]), [gjr_name]
+            )])
+
+        criteria = {name: getattr(fit, rule.criterion)
+                    for name, fit in candidates.items()}
+        table[rule.criterion] = pd.Series(criteria)
+        best_name = rule.select(table, criteria)
+        return best_name, candidates[best_name], table
+
+    def persistence_interval(self, log_ret, fit_model, n_boot=100,
+                             on_progress=None):
+        """
+        Bootstrap confidence interval for the persistence of the fitted
+        model, refitting the same specification on resampled returns.
+        """
+        volatility = fit_model.model.volatility
+        dist = "t" if "nu" in fit_model.params.index else "normal"
+        return bootstrap_garch_persistence(
+            log_ret, p=volatility.p, q=volatility.q, o=volatility.o,
+            dist=dist, n_boot=n_boot, seed=0, params=fit_model.params,
+            on_progress=on_progress
+        )
 
     def plot_garch_volatility(self, fit_model, user_ticker, best_p, best_q):
         """
@@ -270,35 +417,265 @@ class GarchAnalysis(BaseAnalysis):
         plt.tight_layout()
         st.pyplot(fig)
 
-    def analyze_volatility(self, data):
+    def plot_volatility_estimators(self, estimates, user_ticker,
+                                   fit_model=None, scale_factor=1):
         """
-        Main method to perform volatility analysis.
+        Plot daily realized and range-based volatility estimates, together
+        with the daily volatility implied by a fitted GARCH model.
         """
-        if data.empty:
-            st.error("No data available for analysis.")
-            return
+        fig, ax = plt.subplots(figsize=(12, 6))
+        for column in estimates.columns:
+            ax.plot(estimates.index, estimates[column], label=column,
+                    alpha=0.8)
+
+        if fit_model is not None:
+            # Aggregate the per-bar conditional variance to a daily figure
+            garch_var = (fit_model.conditional_volatility / scale_factor) ** 2
+            garch_daily = np.sqrt(
+                garch_var.groupby(session_days(garch_var.index)).sum()
+            )
+            ax.plot(garch_daily.index, garch_daily, label='GARCH',
+                    color='black', linewidth=2)
+
+        ax.set_title(f'Daily Volatility Estimators for {user_ticker}',
+                     fontsize=16)
+        ax.set_xlabel('Date', fontsize=14)
+        ax.set_ylabel('Daily Volatility', fontsize=14)
+        ax.legend()
+        ax.grid(alpha=0.6)
+        plt.tight_layout()
+        st.pyplot(fig)
+
+    def fit_volatility(self, data, fit_garch=True, estimator_window=5,
+                       persistence_samples=0, on_progress=None,
+                       selection_rule=None):
+        """
+        Run the volatility estimators and, if requested, the GARCH model
+        search and fit. Returns a dict of results for render_volatility.
+        on_progress(fraction) follows the search and, if requested, the
+        persistence refits (each half of the way).
+        """
+        result = {
+            'user_ticker': data.name if hasattr(data, 'name') else "Stock",
+            # Quick read from realized and range-based estimators
+            'estimates': estimate_volatility(data, window=estimator_window),
+            'best_model': None,
+        }
+        if not fit_garch:
+            return result
 
         # Used help of chatGPT for Calculating the log returns as my code was failing
         # There is a need to again calculate the log returns
         log_returns = np.log(data['Close'] / data['Close'].shift(1)).dropna()
 
         # Preprocess log returns
-        log_returns, scale_factor = self.preprocess_log_returns(log_returns)
+        log_returns, scale_factor = self.scale_log_returns(log_returns)
+
+        search_progress = persistence_progress = on_progress
+        if on_progress is not None and persistence_samples:
+            search_progress = lambda fraction: on_progress(fraction / 2)
+            persistence_progress = \
+                lambda fraction: on_progress(0.5 + fraction / 2)
 
         # Find best GARCH parameters
-        best_p, best_q = self.find_best_garch_params(log_returns)
+        best_p, best_q, lowest_bic, errors, fits = self.search_garch_params(
+            log_returns, on_progress=search_progress
+        )
 
-        # Fit the best model
-        best_model = self.compare_models_and_pick_best(
-            log_returns, best_p, best_q)
+        # Pick the best model using residual diagnostics of all candidates
+        model_name, best_model, diagnostics = self.select_best_model(
+            log_returns, best_p, best_q, fits, selection_rule
+        )
+
+        interval = None
+        if persistence_samples:
+            interval = self.persistence_interval(
+                log_returns, best_model, persistence_samples,
+                on_progress=persistence_progress
+            )
+
+        result.update({
+            'scale_factor': scale_factor,
+            'best_p': best_p,
+            'best_q': best_q,
+            'lowest_bic': lowest_bic,
+            'errors': errors,
+            'best_model': best_model,
+            'model_name': model_name,
+            'diagnostics': diagnostics,
+            'persistence': interval,
+        })
+        return result
+
+    def render_volatility(self, result):
+        """
+        Display the output of fit_volatility.
+        """
+        user_ticker = result['user_ticker']
+        best_model = result['best_model']
+        if best_model is None:
+            st.subheader("Volatility Estimators")
+            self.plot_volatility_estimators(result['estimates'], user_ticker)
+            return
+
+        st.info(self.scaling_message(result['scale_factor']))
+        self.show_search_messages(result['best_p'], result['best_q'],
+                                  result['lowest_bic'], result['errors'],
+                                  result['model_name'])
 
         # Display model summary
         st.subheader("Model Summary")
+        st.dataframe(result['diagnostics'].style.format("{:.4f}"))
+        interval = result['persistence']
+        if interval is not None:
+            st.metric("Volatility Persistence", f"{interval.estimate:.4f}")
+            st.caption(
+                f"95% confidence interval: [{interval.lower:.4f}, "
+                f"{interval.upper:.4f}] (stationary bootstrap, "
+                f"{len(interval.replicates)} refits)"
+            )
 
         # Plot volatility
         self.plot_garch_volatility(
             best_model,
-            data.name if hasattr(data, 'name') else "Stock",
-            best_p,
-            best_q
+            user_ticker,
+            best_model.model.volatility.p,
+            best_model.model.volatility.q
         )
+
+        st.subheader("Comparison with Volatility Estimators")
+        self.plot_volatility_estimators(
+            result['estimates'], user_ticker, best_model,
+            result['scale_factor']
+        )
+
+    def analyze_volatility(self, data, fit_garch=True, estimator_window=5,
+                           persistence_samples=0):
+        """
+        Main method to perform volatility analysis.
+        """
+        if data.empty:
+            st.error("No data available for analysis.")
+            return
+
+        progress_bar = st.progress(0) if fit_garch else None
+        with st.spinner('Fitting GARCH models...'):
+            result = self.fit_volatility(
+                data, fit_garch, estimator_window, persistence_samples,
+                on_progress=progress_bar.progress if fit_garch else None
+            )
+        self.render_volatility(result)
+
+
+class RiskAnalysis(GarchAnalysis):
+    def __init__(self):
+        super().__init__()
+
+    def fit_hedge_model(self, hedge_data):
+        """
+        Fit a GARCH(1, 1) to the hedging instrument's log returns.
+        """
+        log_returns = np.log(
+            hedge_data['Close'] / hedge_data['Close'].shift(1)).dropna()
+        log_returns, scale_factor = self.scale_log_returns(log_returns)
+        fit = arch_model(log_returns, vol="Garch", p=1, q=1,
+                         dist="normal").fit(disp="off")
+        return fit, scale_factor
+
+    def compute_risk(self,
+                     dataframes,
+                     volatility_result,
+                     user_ticker,
+                     hedge_ticker,
+                     hedge_weight=0.5,
+                     horizon=390,
+                     n_paths=100_000,
+                     level=0.99,
+                     innovations="fhs",
+                     n_jobs=1,
+                     on_progress=None,
+                     calendar=US_EQUITIES):
+        """
+        Simulate forward returns from the fitted stock model and a hedge
+        model and compute VaR and Expected Shortfall for the stock and
+        for a stock-plus-hedge portfolio. Returns None without a GARCH fit.
+        on_progress(fraction) follows the simulated chunks. FHS draws the
+        hedge's residuals as-of the stock's bars on the calendar.
+        """
+        if volatility_result['best_model'] is None:
+            return None
+
+        stock_spec = spec_from_fit(volatility_result['best_model'],
+                                   volatility_result['scale_factor'])
+        hedge_fit, hedge_scale = self.fit_hedge_model(
+            dataframes[hedge_ticker])
+        hedge_spec = spec_from_fit(hedge_fit, hedge_scale)
+
+        log_returns = simulate_returns(
+            [stock_spec, hedge_spec], n_paths=n_paths, horizon=horizon,
+            innovations=innovations, seed=0, n_jobs=n_jobs,
+            on_progress=on_progress, calendar=calendar
+        )
+        weights = [1.0 - hedge_weight, hedge_weight]
+        stock_returns = np.expm1(log_returns[:, 0])
+        portfolio = portfolio_returns(log_returns, weights)
+
+        risk = {}
+        for name, returns in [(user_ticker, stock_returns),
+                              ("Portfolio", portfolio)]:
+            var, es = value_at_risk(returns, level)
+            risk[name] = {'VaR': var, 'ES': es}
+
+        return {
+            'risk': pd.DataFrame(risk).T,
+            'portfolio_returns': portfolio,
+            'stock_returns': stock_returns,
+            'hedge_weight': hedge_weight,
+            'horizon': horizon,
+            'n_paths': n_paths,
+            'level': level,
+            'innovations': innovations,
+        }
+
+    def render_risk(self, result, user_ticker, hedge_ticker):
+        """
+        Display the output of compute_risk.
+        """
+        if result is None:
+            st.info("Enable GARCH fitting to simulate Value-at-Risk.")
+            return
+
+        level = result['level']
+        st.write(
+            f"{result['n_paths']:,} simulated paths over "
+            f"{result['horizon']} bars ({result['innovations'].upper()} "
+            f"innovations). Portfolio: "
+            f"{1 - result['hedge_weight']:.0%} {user_ticker}, "
+            f"{result['hedge_weight']:.0%} {hedge_ticker}."
+        )
+        st.dataframe(result['risk'].style.format("{:.2%}"))
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        for label, returns, color in [
+                (user_ticker, result['stock_returns'], 'blue'),
+                ("Portfolio", result['portfolio_returns'], 'purple')]:
+            ax.hist(returns, bins=200, alpha=0.5, color=color, label=label)
+            ax.axvline(-result['risk'].loc[label, 'VaR'], color=color,
+                       linestyle='--', linewidth=0.8)
+        ax.set_title(f"Simulated Returns and {level:.0%} VaR", fontsize=16)
+        ax.set_xlabel("Return", fontsize=14)
+        ax.set_ylabel("Paths", fontsize=14)
+        ax.legend()
+        ax.grid(alpha=0.6)
+        plt.tight_layout()
+        st.pyplot(fig)
+
+    def analyze_risk(self, dataframes, volatility_result, user_ticker,
+                     hedge_ticker, **kwargs):
+        """
+        Main method to perform the Monte Carlo risk analysis.
+        """
+        with st.spinner('Simulating paths...'):
+            result = self.compute_risk(dataframes, volatility_result,
+                                       user_ticker, hedge_ticker, **kwargs)
+        self.render_risk(result, user_ticker, hedge_ticker)
@@ -0,0 +1,435 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import argparse
+import contextlib
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+import pandas as pd
+from src.question.text_input import DataFetcher
+from src.question.multi_choice import CorrelationAnalysis, GarchAnalysis
+from src.question.alignment import US_EQUITIES
+
+
+class ServiceBusy(Exception):
+    """Raised when the worker pool and its queue are full."""
+
+
+class NotFound(Exception):
+    """Raised when no data is available for a request."""
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+    """
+    def __init__(self, ttl=60, max_size=128):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+def _number(value):
+    """
+    Convert a number to a JSON-ready float, NaN/inf as null.
+    """
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _clean(values):
+    """
+    Convert an array to a JSON-ready list with NaN/inf as null.
+    """
+    return [_number(v) for v in np.asarray(values, dtype=np.float64)]
+
+
+def to_columnar(data):
+    """
+    Encode a DataFrame or Series as compact columnar arrays: the index as
+    epoch milliseconds (or labels) and one list per column.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame(data.name if data.name is not None else "value")
+    index = data.index
+    if isinstance(index, pd.DatetimeIndex):
+        index = (index.to_numpy().astype("datetime64[ms]")
+                 .astype(np.int64).tolist())
+    else:
+        index = [str(label) for label in index]
+    return {
+        "index": index,
+        "columns": {str(col): _clean(data[col]) for col in data.columns},
+    }
+
+
+def _interval(interval):
+    if interval is None:
+        return None
+    return {"estimate": _number(interval.estimate),
+            "lower": _number(interval.lower),
+            "upper": _number(interval.upper),
+            "samples": len(interval.replicates)}
+
+
+class AnalysisService:
+    """
+    Headless access to data fetching and the correlation and volatility
+    analyses. Requests run on a fixed worker pool with a bounded queue;
+    encoded results are cached with an ETag for `cache_ttl` seconds and
+    identical in-flight requests share one computation.
+    """
+    def __init__(self, fetcher=None, max_workers=2, max_queue=8,
+                 cache_ttl=60, cache_size=128):
+        self.fetcher = fetcher or DataFetcher()
+        self.cache_ttl = cache_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._results = TTLCache(cache_ttl, cache_size)
+        self._frames = TTLCache(cache_ttl, cache_size)
+        self._in_flight = {}
+        self._fetching = {}
+        self._lock = threading.Lock()
+        self.endpoints = {
+            "data": self.get_data,
+            "correlation": self.correlation,
+            "volatility": self.volatility,
+        }
+
+    def frame(self, ticker, days):
+        """
+        Fetch (or reuse) price data for one ticker. Concurrent requests
+        for the same ticker and days share a single fetch.
+        """
+        key = (ticker, days)
+        with self._lock:
+            data = self._frames.get(key)
+            if data is not None:
+                return data
+            future = self._fetching.get(key)
+            owner = future is None
+            if owner:
+                future = self._fetching[key] = Future()
+
+        if owner:
+            try:
+                data = self.fetcher.get_data([ticker], days=days).get(ticker)
+                if data is not None:
+                    self._frames.put(key, data)
+                future.set_result(data)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._fetching.pop(key, None)
+        return future.result()
+
+    def dataframes(self, tickers, days):
+        """
+        Fetch (or reuse) price data for all tickers.
+        """
+        dataframes = {ticker: self.frame(ticker, days) for ticker in tickers}
+        missing = [t for t, data in dataframes.items() if data is None]
+        if missing:
+            raise NotFound(f"No data available for {', '.join(missing)}.")
+        return dataframes
+
+    def get_data(self, tickers, days=180):
+        """
+        OHLC price data for each ticker.
+        """
+        dataframes = self.dataframes(tickers, days)
+        return {"days": days,
+                "data": {t: to_columnar(dataframes[t]) for t in tickers}}
+
+    def correlation(self, ticker, hedge="C:XAUUSD", days=180, window=30,
+                    bootstrap=1000):
+        """
+        Correlation of the ticker's log returns with the hedge.
+        """
+        dataframes = self.dataframes([ticker, hedge], days)
+        result = CorrelationAnalysis().compute_correlation(
+            dataframes, ticker, hedge, rolling_window=window,
+            calendar=US_EQUITIES, bootstrap_samples=bootstrap
+        )
+        aligned = result['aligned_data']
+        return {
+            "ticker": ticker,
+            "hedge": hedge,
+            "days": days,
+            "correlation": _number(result['correlation']),
+            "interval": _interval(result['interval']),
+            "rolling_window": window,
+            "series": to_columnar(aligned.assign(
+                Rolling_Correlation=result['rolling_corr'])),
+        }
+
+    def volatility(self, ticker, days=180, garch=True, persistence=0):
+        """
+        Volatility estimators and, if requested, the selected GARCH model.
+        """
+        dataframes = self.dataframes([ticker], days)
+        result = GarchAnalysis().fit_volatility(
+            dataframes[ticker], fit_garch=garch,
+            persistence_samples=persistence
+        )
+        payload = {
+            "ticker": ticker,
+            "days": days,
+            "estimators": to_columnar(result['estimates']),
+        }
+        model = result['best_model']
+        if model is not None:
+            scale = result['scale_factor']
+            payload.update({
+                "model": result['model_name'],
+                "scale_factor": scale,
+                "params": {k: _number(v) for k, v in model.params.items()},
+                "bic": _number(model.bic),
+                "diagnostics": to_columnar(result['diagnostics']),
+                "persistence": _interval(result['persistence']),
+                "conditional_volatility": to_columnar(
+                    (model.conditional_volatility / scale)
+                    .rename("Conditional_Volatility")),
+            })
+        return payload
+
+    def handle(self, endpoint, params):
+        """
+        Run an endpoint with caching and backpressure. Returns the
+        encoded JSON body and its ETag.
+        """
+        if endpoint not in self.endpoints:
+            raise NotFound(f"Unknown endpoint: {endpoint}")
+        key = (endpoint, tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in params.items()
+        )))
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                if not self._slots.acquire(blocking=False):
+                    raise ServiceBusy("Too many requests in progress.")
+                future = self._executor.submit(self._run, key, endpoint,
+                                               params)
+                self._in_flight[key] = future
+        return future.result()
+
+    def _run(self, key, endpoint, params):
+        try:
+            payload = self.endpoints[endpoint](**params)
+            body = json.dumps(payload, separators=(",", ":")).encode()
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            self._results.put(key, (body, etag))
+            return body, etag
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+def _flag(value):
+    return str(value).lower() not in ("0", "false", "no", "off")
+
+
+def parse_params(endpoint, query):
+    """
+    Validate query parameters for an endpoint. Raises ValueError.
+    """
+    def one(name, default=None):
+        values = query.get(name)
+        if not values:
+            if default is None:
+                raise ValueError(f"Missing parameter: {name}")
+            return default
+        return values[-1].strip()
+
+    def bounded(name, default, upper, lower=1):
+        value = int(one(name, str(default)))
+        if not lower <= value <= upper:
+            raise ValueError(f"{name} must be between {lower} and {upper}.")
+        return value
+
+    days = bounded("days", 180, 730)
+    if endpoint == "data":
+        tickers = [t.strip().upper() for t in one("tickers").split(",")
+                   if t.strip()]
+        return {"tickers": tickers, "days": days}
+    if endpoint == "correlation":
+        return {"ticker": one("ticker").upper(),
+                "hedge": one("hedge", "C:XAUUSD").upper(),
+                "days": days,
+                "window": bounded("window", 30, 10_000),
+                "bootstrap": bounded("bootstrap", 1000, 10_000, lower=0)}
+    if endpoint == "volatility":
+        return {"ticker": one("ticker").upper(),
+                "days": days,
+                "garch": _flag(one("garch", "1")),
+                "persistence": bounded("persistence", 0, 500, lower=0)}
+    raise NotFound(f"Unknown endpoint: {endpoint}")
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Check an If-None-Match header against an ETag using weak comparison:
+    whole tags, W/ prefixes ignored, * matches anything.
+    """
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in tags:
+        return True
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/")
+               for tag in tags if tag)
+
+
+def make_handler(service):
+    """
+    Build a request handler class bound to the service.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body=b"", etag=None):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control",
+                                 f"max-age={service.cache_ttl}")
+            if status == 503:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message):
+            self._send(status, json.dumps({"error": message}).encode())
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            endpoint = url.path.strip("/")
+            if endpoint == "health":
+                self._send(200, b'{"status":"ok"}')
+                return
+            try:
+                params = parse_params(endpoint, parse_qs(url.query))
+                body, etag = service.handle(endpoint, params)
+            except NotFound as e:
+                self._error(404, str(e))
+            except ValueError as e:
+                self._error(400, str(e))
+            except ServiceBusy as e:
+                self._error(503, str(e))
+            except Exception as e:
+                self._error(500, f"Analysis failed: {e}")
+            else:
+                if etag_matches(self.headers.get("If-None-Match", ""), etag):
+                    self._send(304, etag=etag)
+                else:
+                    self._send(200, body, etag)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def make_server(service, host="127.0.0.1", port=8000):
+    """
+    Create (but do not start) the HTTP server for a service.
+    """
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+def main(argv=None):
+    """
+    Command line entry point: serve the JSON API or run one analysis.
+    """
+    parser = argparse.ArgumentParser(
+        description="Headless Financial Market Analysis service.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the HTTP JSON API.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, default=2)
+    serve.add_argument("--queue", type=int, default=8)
+    serve.add_argument("--cache-ttl", type=int, default=60)
+
+    for name in ("data", "correlation", "volatility"):
+        command = commands.add_parser(name, help=f"Print {name} as JSON.")
+        command.add_argument("ticker" if name != "data" else "tickers")
+        command.add_argument("--days", default="180")
+        if name == "correlation":
+            command.add_argument("--hedge", default="C:XAUUSD")
+            command.add_argument("--window", default="30")
+            command.add_argument("--bootstrap", default="1000",
+                                 help="Bootstrap samples, 0 to skip.")
+        if name == "volatility":
+            command.add_argument("--garch", default="1")
+            command.add_argument("--persistence", default="0",
+                                 help="Persistence refits, 0 to skip.")
+
+    args = vars(parser.parse_args(argv))
+    command = args.pop("command")
+
+    if command == "serve":
+        service = AnalysisService(max_workers=args["workers"],
+                                  max_queue=args["queue"],
+                                  cache_ttl=args["cache_ttl"])
+        server = make_server(service, args["host"], args["port"])
+        print(f"Serving on http://{args['host']}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.shutdown()
+        return 0
+
+    service = AnalysisService()
+    try:
+        params = parse_params(command, {k: [v] for k, v in args.items()})
+        # Keep stdout for the JSON result only
+        with contextlib.redirect_stdout(sys.stderr):
+            body, _ = service.handle(command, params)
+    except (NotFound, ValueError) as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 1
+    finally:
+        service.shutdown()
+    print(body.decode())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.question.alignment import AsOfAligner
+
+
+INNOVATIONS = ("fhs", "normal", "t")
+
+
+def spec_from_fit(fit, scale_factor=1):
+    """
+    Extract what the simulation needs from a fitted arch model: the
+    parameters, the last residuals and conditional variances (most
+    recent first) and the standardized residuals.
+    """
+    params = fit.params
+    vol = fit.model.volatility
+    resid = fit.resid.dropna()
+    sigma = fit.conditional_volatility.reindex(resid.index)
+    max_lag = max(vol.p, vol.o, vol.q, 1)
+
+    return {
+        'mu': params.get('mu', 0.0),
+        'omega': params['omega'],
+        'alpha': [params[f'alpha[{i}]'] for i in range(1, vol.p + 1)],
+        'gamma': [params[f'gamma[{i}]'] for i in range(1, vol.o + 1)],
+        'beta': [params[f'beta[{i}]'] for i in range(1, vol.q + 1)],
+        'nu': params.get('nu'),
+        'eps': resid.to_numpy()[::-1][:max_lag],
+        'sigma2': sigma.to_numpy()[::-1][:max_lag] ** 2,
+        'std_resid': resid / sigma,
+        'scale': scale_factor,
+    }
+
+
+def _pad(rows, width):
+    out = np.zeros((len(rows), width))
+    for i, row in enumerate(rows):
+        row = np.asarray(row, dtype=np.float64)[:width]
+        out[i, :len(row)] = row
+    return out
+
+
+def joint_residuals(specs, calendar=None, tolerance="5min"):
+    """
+    Time-aligned standardized residuals of all specs, one row per bar of
+    the first spec. The others are taken as-of each bar (no older than
+    `tolerance`, within the same calendar session). Rows that open a
+    session are left out: their residuals carry the overnight gap rather
+    than a one-bar shock. Rows with any missing value are dropped.
+    """
+    reference = specs[0]['std_resid'].sort_index()
+    aligner = AsOfAligner(reference.index, calendar=calendar,
+                          tolerance=tolerance)
+    _, residuals = aligner.align_many({
+        i: spec['std_resid'].sort_index().to_frame('z')
+        for i, spec in enumerate(specs)
+    }, column='z')
+    residuals = residuals.T[~aligner.session_starts()]
+    return residuals[np.isfinite(residuals).all(axis=1)]
+
+
+def build_model(specs, innovations="fhs", nu=None, calendar=None,
+                tolerance="5min"):
+    """
+    Stack one or more model specs into padded arrays so all assets are
+    simulated together. Innovations for several assets are drawn jointly:
+    FHS resamples whole rows of residuals aligned with joint_residuals,
+    the parametric choices use their correlation.
+    """
+    if innovations not in INNOVATIONS:
+        raise ValueError(f"Unknown innovations: {innovations}")
+
+    n_arch = max(max(len(s['alpha']), len(s['gamma'])) for s in specs)
+    n_garch = max(len(s['beta']) for s in specs)
+    width = max(n_arch, n_garch, 1)
+
+    std_resid = joint_residuals(specs, calendar, tolerance)
+    if len(std_resid) < 2:
+        raise ValueError("Not enough aligned residuals to simulate.")
+
+    if nu is None:
+        nus = [s['nu'] for s in specs if s['nu'] is not None]
+        nu = min(nus) if nus else 8.0
+    if innovations == "t" and nu <= 2:
+        raise ValueError("Student's t innovations need nu > 2.")
+
+    return {
+        'mu': np.array([s['mu'] for s in specs], dtype=np.float64),
+        'omega': np.array([s['omega'] for s in specs], dtype=np.float64),
+        'alpha': _pad([s['alpha'] for s in specs], width),
+        'gamma': _pad([s['gamma'] for s in specs], width),
+        'beta': _pad([s['beta'] for s in specs], width),
+        'eps': _pad([s['eps'] for s in specs], width),
+        'sigma2': _pad([s['sigma2'] for s in specs], width),
+        'scale': np.array([s['scale'] for s in specs], dtype=np.float64),
+        'innovations': innovations,
+        'std_resid': std_resid,
+        'chol': np.linalg.cholesky(np.atleast_2d(np.corrcoef(std_resid.T))),
+        'nu': nu,
+    }
+
+
+def _draw(model, rng, n_paths):
+    """
+    Draw one step of (n_paths x assets) unit-variance innovations.
+    """
+    if model['innovations'] == "fhs":
+        rows = rng.integers(0, len(model['std_resid']), n_paths)
+        return model['std_resid'][rows]
+
+    z = rng.standard_normal((n_paths, len(model['mu']))) @ model['chol'].T
+    if model['innovations'] == "t":
+        nu = model['nu']
+        z *= np.sqrt((nu - 2.0) / rng.chisquare(nu, (n_paths, 1)))
+    return z
+
+
+def simulate_chunk(model, n_paths, horizon, seed):
+    """
+    Simulate n_paths GARCH paths for all assets at once and return
+    their cumulative log returns over the horizon (n_paths x assets).
+    Only the loop over time steps runs in Python.
+    """
+    rng = np.random.default_rng(seed)
+    n_assets, width = model['eps'].shape
+    # One (n_paths x assets) array per lag, most recent first, so
+    # shifting the windows is a list rotation rather than a copy
+    eps = [np.repeat(model['eps'][None, :, j], n_paths, axis=0)
+           for j in range(width)]
+    sigma2_hist = [np.repeat(model['sigma2'][None, :, j], n_paths, axis=0)
+                   for j in range(width)]
+    terms = [(j, model['alpha'][:, j], model['gamma'][:, j],
+              model['beta'][:, j]) for j in range(width)]
+    total = np.zeros((n_paths, n_assets))
+
+    for _ in range(horizon):
+        sigma2 = np.broadcast_to(model['omega'], total.shape).copy()
+        for j, alpha, gamma, beta in terms:
+            eps_sq = eps[j] * eps[j]
+            if alpha.any():
+                sigma2 += alpha * eps_sq
+            if gamma.any():
+                sigma2 += gamma * eps_sq * (eps[j] < 0)
+            if beta.any():
+                sigma2 += beta * sigma2_hist[j]
+        shock = np.sqrt(sigma2)
+        shock *= _draw(model, rng, n_paths)
+        total += shock
+
+        eps.pop()
+        eps.insert(0, shock)
+        sigma2_hist.pop()
+        sigma2_hist.insert(0, sigma2)
+
+    total += horizon * model['mu']
+    return total / model['scale']
+
+
+def simulate_returns(specs, n_paths=100_000, horizon=390, innovations="fhs",
+                     seed=None, chunk_size=20_000, n_jobs=1,
+                     on_progress=None, calendar=None, tolerance="5min"):
+    """
+    Simulate cumulative log returns over `horizon` steps for one or more
+    fitted models. Paths are generated in chunks with independent seeds
+    spawned from `seed`, so results do not depend on n_jobs; n_jobs > 1
+    spreads the chunks over a process pool. on_progress(fraction) is
+    called after each chunk; if it raises, pending chunks are cancelled.
+    The calendar and tolerance align the assets' residuals.
+    """
+    model = build_model(specs, innovations, calendar=calendar,
+                        tolerance=tolerance)
+    sizes = [min(chunk_size, n_paths - start)
+             for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    def report(done):
+        if on_progress is not None:
+            on_progress(done / len(sizes))
+
+    chunks = []
+    if n_jobs == 1:
+        for size, chunk_seed in zip(sizes, seeds):
+            chunks.append(simulate_chunk(model, size, horizon, chunk_seed))
+            report(len(chunks))
+        return np.concatenate(chunks)
+
+    # Callers run in threads (GUI jobs), where forking can deadlock
+    executor = ProcessPoolExecutor(
+        max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        futures = [executor.submit(simulate_chunk, model, size, horizon,
+                                   chunk_seed)
+                   for size, chunk_seed in zip(sizes, seeds)]
+        for future in futures:
+            chunks.append(future.result())
+            report(len(chunks))
+    finally:
+        # Drop queued chunks if the caller stopped early
+        executor.shutdown(wait=True, cancel_futures=True)
+    return np.concatenate(chunks)
+
+
+def portfolio_returns(log_returns, weights):
+    """
+    Simple portfolio returns from per-asset cumulative log returns.
+    """
+    return np.expm1(log_returns) @ np.asarray(weights, dtype=np.float64)
+
+
+def value_at_risk(returns, level=0.99):
+    """
+    Value-at-Risk and Expected Shortfall of simulated returns at the
+    given confidence level, both reported as positive losses.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    cutoff = np.quantile(returns, 1.0 - level)
+    return -cutoff, -returns[returns <= cutoff].mean()
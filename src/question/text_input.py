@@ -39,11 +39,15 @@ class DataFetcher(BaseAnalysis):
 
     def process_data(self, aggs):
         """
-        Convert aggregates into a DataFrame with Timestamp and Close prices.
+        Convert aggregates into a DataFrame with Timestamp and
+        Open, High, Low and Close prices.
         """
         if not aggs:
             return pd.DataFrame()
 
+        opening_prices = [agg.open for agg in aggs]
+        high_prices = [agg.high for agg in aggs]
+        low_prices = [agg.low for agg in aggs]
         closing_prices = [agg.close for agg in aggs]
         timestamps = [agg.timestamp for agg in aggs]
 
@@ -53,21 +57,25 @@ class DataFetcher(BaseAnalysis):
         # Create a DataFrame
         df = pd.DataFrame({
             "Timestamp": timestamps,
+            "Open": opening_prices,
+            "High": high_prices,
+            "Low": low_prices,
             "Close": closing_prices
         })
         df.set_index("Timestamp", inplace=True)
         return df
 
-    def get_data(self, tickers, days=180):
+    def get_data(self, tickers, days=180, on_progress=None):
         """
-        Fetch and process data for multiple tickers.
+        Fetch and process data for multiple tickers, calling
+        on_progress(fraction) after each one.
         """
         end_date = datetime.today().strftime("%Y-%m-%d")
         start_date = (datetime.today() - timedelta(
             days=days)).strftime("%Y-%m-%d")
 
         dataframes = {}
-        for ticker in tickers:
+        for done, ticker in enumerate(tickers, start=1):
             print(f"Fetching data for {ticker}...")
             aggs = self.fetch_aggregates(ticker, start_date, end_date)
             df = self.process_data(aggs)
@@ -75,5 +83,7 @@ class DataFetcher(BaseAnalysis):
                 dataframes[ticker] = df
             else:
                 print(f"Data for {ticker} is not available.")
+            if on_progress is not None:
+                on_progress(done / len(tickers))
 
         return dataframes
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+
+RANGE_ESTIMATORS = ("Parkinson", "Garman-Klass", "Rogers-Satchell",
+                    "Yang-Zhang")
+
+# Bars are grouped into days by the exchange's local date, so extended
+# hours sessions (04:00-20:00 ET) never straddle a UTC midnight
+EXCHANGE_TZ = "America/New_York"
+
+
+def _as_float(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def rolling_mean(values, window):
+    """
+    Rolling mean over the last `window` observations computed from
+    cumulative sums. Windows containing a NaN are returned as NaN.
+    """
+    values = _as_float(values)
+    if window <= 1:
+        return values.copy()
+
+    valid = np.isfinite(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+
+    out = np.full(values.shape, np.nan)
+    window_sum = sums[window:] - sums[:-window]
+    window_count = counts[window:] - counts[:-window]
+    out[window - 1:] = np.where(window_count == window,
+                                window_sum / window, np.nan)
+    return out
+
+
+def rolling_variance(values, window):
+    """
+    Rolling sample variance (ddof=1) over the last `window` observations.
+    """
+    if window < 2:
+        raise ValueError("Rolling variance needs a window of at least 2.")
+    values = _as_float(values)
+    mean = rolling_mean(values, window)
+    mean_sq = rolling_mean(values ** 2, window)
+    return np.maximum(mean_sq - mean ** 2, 0.0) * window / (window - 1)
+
+
+def day_codes(timestamps, tz=EXCHANGE_TZ):
+    """
+    Map timestamps (naive ones are UTC) to integer day numbers of their
+    local date in `tz`.
+    """
+    ts = pd.DatetimeIndex(timestamps)
+    if ts.tz is None:
+        ts = ts.tz_localize("UTC")
+    ts = ts.tz_convert(tz).tz_localize(None)
+    return ts.to_numpy().astype("datetime64[D]").view(np.int64)
+
+
+def session_days(timestamps, tz=EXCHANGE_TZ):
+    """
+    Return the local trading date of each timestamp as a DatetimeIndex.
+    """
+    return pd.DatetimeIndex(
+        day_codes(timestamps, tz).astype("datetime64[D]")
+        .astype("datetime64[ns]"))
+
+
+def _day_starts(days):
+    """
+    Return positions where a new day starts in a sorted day array.
+    """
+    new_day = np.empty(len(days), dtype=bool)
+    new_day[:1] = True
+    np.not_equal(days[1:], days[:-1], out=new_day[1:])
+    return np.flatnonzero(new_day)
+
+
+def daily_ohlc(timestamps, open_, high, low, close, tz=EXCHANGE_TZ):
+    """
+    Aggregate intraday bars to daily open/high/low/close in one pass.
+    Returns a DataFrame indexed by local date with an extra Bars column.
+    """
+    days = day_codes(timestamps, tz)
+    if len(days) == 0:
+        return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Bars"])
+
+    order = np.argsort(days, kind="stable")
+    days = days[order]
+    starts = _day_starts(days)
+    ends = np.append(starts[1:], len(days)) - 1
+
+    high = _as_float(high)[order]
+    low = _as_float(low)[order]
+    index = pd.to_datetime(days[starts], unit="D")
+    return pd.DataFrame({
+        "Open": _as_float(open_)[order][starts],
+        "High": np.maximum.reduceat(high, starts),
+        "Low": np.minimum.reduceat(low, starts),
+        "Close": _as_float(close)[order][ends],
+        "Bars": ends - starts + 1,
+    }, index=index)
+
+
+def realized_variance(timestamps, close, tz=EXCHANGE_TZ):
+    """
+    Daily realized variance: the sum of squared intraday log returns
+    within each local day. Overnight returns are excluded and days with
+    fewer than two bars are NaN.
+    """
+    days = day_codes(timestamps, tz)
+    if len(days) == 0:
+        return pd.Series(dtype=np.float64)
+
+    order = np.argsort(days, kind="stable")
+    days = days[order]
+    close = _as_float(close)[order]
+    starts = _day_starts(days)
+
+    day_index = np.zeros(len(days), dtype=np.int64)
+    day_index[starts[1:]] = 1
+    day_index = np.cumsum(day_index)
+
+    returns = np.diff(np.log(close))
+    same_day = days[1:] == days[:-1]
+    rv = np.bincount(day_index[1:][same_day],
+                     weights=returns[same_day] ** 2,
+                     minlength=len(starts)).astype(np.float64)
+    bars = np.diff(np.append(starts, len(days)))
+    rv[bars < 2] = np.nan
+    return pd.Series(rv, index=pd.to_datetime(days[starts], unit="D"))
+
+
+def parkinson(high, low, window=1):
+    """
+    Parkinson (1980) high-low range variance estimator.
+    """
+    hl = np.log(_as_float(high) / _as_float(low))
+    return rolling_mean(hl ** 2 / (4.0 * np.log(2.0)), window)
+
+
+def garman_klass(open_, high, low, close, window=1):
+    """
+    Garman-Klass (1980) OHLC variance estimator.
+    """
+    hl = np.log(_as_float(high) / _as_float(low))
+    co = np.log(_as_float(close) / _as_float(open_))
+    var = 0.5 * hl ** 2 - (2.0 * np.log(2.0) - 1.0) * co ** 2
+    return rolling_mean(var, window)
+
+
+def rogers_satchell(open_, high, low, close, window=1):
+    """
+    Rogers-Satchell (1991) drift-independent variance estimator.
+    """
+    o, h, l, c = (np.log(_as_float(x)) for x in (open_, high, low, close))
+    var = (h - c) * (h - o) + (l - c) * (l - o)
+    return rolling_mean(var, window)
+
+
+def yang_zhang(open_, high, low, close, window=20):
+    """
+    Yang-Zhang (2000) variance estimator combining overnight, open-to-close
+    and Rogers-Satchell variances over a rolling window.
+    """
+    if window < 2:
+        raise ValueError("Yang-Zhang needs a window of at least 2.")
+    open_, close = _as_float(open_), _as_float(close)
+
+    overnight = np.full(open_.shape, np.nan)
+    overnight[1:] = np.log(open_[1:] / close[:-1])
+    open_close = np.log(close / open_)
+
+    k = 0.34 / (1.34 + (window + 1) / (window - 1))
+    return (rolling_variance(overnight, window)
+            + k * rolling_variance(open_close, window)
+            + (1.0 - k) * rogers_satchell(open_, high, low, close, window))
+
+
+def estimate_volatility(data, window=5, tz=EXCHANGE_TZ):
+    """
+    Compute daily volatility (square root of variance) from intraday bars
+    using realized variance and, when Open/High/Low are present, the
+    Parkinson, Garman-Klass, Rogers-Satchell and Yang-Zhang estimators.
+    All estimators are smoothed over the same rolling window of days.
+    """
+    if data.empty:
+        return pd.DataFrame()
+
+    rv = realized_variance(data.index, data["Close"].to_numpy(), tz)
+    estimates = {"Realized": rolling_mean(rv.to_numpy(), window)}
+
+    if {"Open", "High", "Low"}.issubset(data.columns):
+        daily = daily_ohlc(data.index, data["Open"].to_numpy(),
+                           data["High"].to_numpy(), data["Low"].to_numpy(),
+                           data["Close"].to_numpy(), tz)
+        o, h, l, c = (daily[col].to_numpy()
+                      for col in ("Open", "High", "Low", "Close"))
+        estimates["Parkinson"] = parkinson(h, l, window)
+        estimates["Garman-Klass"] = garman_klass(o, h, l, c, window)
+        estimates["Rogers-Satchell"] = rogers_satchell(o, h, l, c, window)
+        estimates["Yang-Zhang"] = yang_zhang(o, h, l, c, max(window, 2))
+
+    variances = pd.DataFrame(estimates, index=rv.index)
+    return np.sqrt(variances.clip(lower=0))
@@ -0,0 +1,121 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import pytest
+from src.question.alignment import SessionCalendar, AsOfAligner
+import pandas as pd
+import numpy as np
+
+
+@pytest.fixture
+def calendar():
+    """Fixture providing a US equities session calendar."""
+    return SessionCalendar()
+
+
+@pytest.fixture
+def hedge_data():
+    """
+    Fixture providing round-the-clock minute bars for a hedge,
+    2024-01-02 (Tue) to 2024-01-04 (Thu), in naive UTC.
+    """
+    index = pd.date_range("2024-01-02", "2024-01-04 23:59", freq="min")
+    return pd.DataFrame({'Close': np.arange(len(index), dtype=float) + 1},
+                        index=index)
+
+
+def test_minute_index_covers_sessions(calendar):
+    """Test that the reference clock has 390 minutes per session in UTC."""
+    index = calendar.minute_index("2024-01-02", "2024-01-05")
+
+    assert len(index) == 3 * 390  # Tue-Thu, the range ends at midnight
+    assert index[0] == pd.Timestamp("2024-01-02 14:30")
+    assert index[389] == pd.Timestamp("2024-01-02 20:59")
+    assert calendar.minute_index("2024-01-02", "2024-01-05").equals(index)
+
+
+def test_minute_index_cache_is_shared_and_bounded():
+    """Test that starts within the same days share one bounded cache."""
+    calendar = SessionCalendar(cache_size=2)
+    starts = pd.date_range("2024-01-02 14:30", periods=50, freq="min")
+    for start in starts:
+        index = calendar.minute_index(start, "2024-01-05")
+        assert index[0] == start
+    assert len(calendar._index_cache) == 1
+
+    for day in range(8, 13):
+        calendar.minute_index(f"2024-01-{day:02d}", "2024-01-20")
+    assert len(calendar._index_cache) == 2
+    assert len(calendar._bounds_cache) <= 2
+
+
+def test_minute_index_tz_aware_bounds(calendar):
+    """Test that tz-aware start and end are treated as UTC instants."""
+    aware = calendar.minute_index(
+        pd.Timestamp("2024-01-02 09:30", tz="America/New_York"),
+        pd.Timestamp("2024-01-04 23:59", tz="UTC"))
+
+    assert aware.equals(calendar.minute_index("2024-01-02 14:30",
+                                              "2024-01-04 23:59"))
+    assert len(aware) == 3 * 390
+
+
+def test_log_returns_break_at_gaps_without_calendar():
+    """Test that an overnight gap is not a return without a calendar."""
+    index = pd.DatetimeIndex(["2024-01-02 20:58", "2024-01-02 20:59",
+                              "2024-01-03 14:30", "2024-01-03 14:31"])
+    aligner = AsOfAligner(index, tolerance="5min")
+    returns = aligner.log_returns(np.array([100.0, 100.0, 110.0, 110.0]))
+
+    assert np.isnan(returns[[0, 2]]).all()
+    assert np.allclose(returns[[1, 3]], 0.0)
+
+
+def test_session_ids(calendar):
+    """Test mapping of timestamps to sessions."""
+    ids = calendar.session_ids(pd.DatetimeIndex([
+        "2024-01-02 14:29", "2024-01-02 14:30", "2024-01-02 20:59",
+        "2024-01-02 21:00", "2024-01-03 15:00", "2024-01-06 15:00",
+    ]))
+
+    assert ids[0] == -1 and ids[3] == -1 and ids[5] == -1
+    assert ids[1] == ids[2] != ids[4]
+
+
+def test_asof_tolerance_and_sessions(calendar):
+    """Test staleness tolerance and that values never cross sessions."""
+    reference = pd.DatetimeIndex([
+        "2024-01-02 14:30", "2024-01-02 14:33", "2024-01-02 14:40",
+        "2024-01-03 14:30",
+    ])
+    data = pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=pd.DatetimeIndex([
+        "2024-01-02 14:29", "2024-01-02 14:31", "2024-01-02 20:59",
+    ]))
+    aligner = AsOfAligner(reference, calendar=calendar, tolerance="5min")
+
+    values = aligner.align(data)
+
+    # 14:29 is pre-open, 14:40 is stale, the 20:59 bar is the prior session
+    assert np.isnan(values[0])
+    assert values[1] == 2.0
+    assert np.isnan(values[2])
+    assert np.isnan(values[3])
+
+
+def test_align_many_and_session_returns(calendar, hedge_data):
+    """Test aligning several tickers and breaking returns at sessions."""
+    aligner = AsOfAligner.from_calendar(calendar, "2024-01-02", "2024-01-05")
+    stock = hedge_data.iloc[::2] * 10
+
+    tickers, prices = aligner.align_many(
+        {'AAPL': stock, 'C:XAUUSD': hedge_data})
+    returns = aligner.log_returns(prices)
+
+    assert tickers == ['AAPL', 'C:XAUUSD']
+    assert prices.shape == (2, 3 * 390)
+    assert not np.isnan(prices).any()
+    # First bar of each session has no return, overnight gap excluded
+    assert np.isnan(returns[:, [0, 390, 780]]).all()
+    assert not np.isnan(returns[:, 1:390]).any()
+    assert returns[1, 1] == pytest.approx(
+        np.log(prices[1, 1] / prices[1, 0]))
@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import pytest
+from src.question import bootstrap
+from src.question.bootstrap import (
+    resample_indices, bootstrap_correlation, bootstrap_garch_persistence,
+    garch_persistence
+)
+import pandas as pd
+import numpy as np
+from arch import arch_model
+
+
+@pytest.fixture
+def correlated_returns():
+    """Fixture providing two correlated return series."""
+    rng = np.random.default_rng(69)
+    base = rng.normal(0, 1, 500)
+    return base + rng.normal(0, 1, 500), base + rng.normal(0, 1, 500)
+
+
+@pytest.mark.parametrize('method', ['stationary', 'block'])
+def test_resample_indices(method):
+    """Test shape and range of bootstrap index matrices."""
+    idx = resample_indices(100, 50, method=method, block_length=5, rng=1)
+
+    assert idx.shape == (50, 100)
+    assert idx.min() >= 0 and idx.max() < 100
+    # Blocks keep consecutive observations together most of the time
+    steps = np.diff(idx, axis=1)
+    assert ((steps == 1) | (steps == -99)).mean() > 0.7
+
+
+def test_resample_indices_unknown_method():
+    """Test that an unknown method raises an error."""
+    with pytest.raises(ValueError):
+        resample_indices(10, 5, method='jackknife')
+
+
+def test_bootstrap_correlation(correlated_returns, monkeypatch):
+    """Test the correlation interval and batching."""
+    x, y = correlated_returns
+    interval = bootstrap_correlation(x, y, n_boot=1000, seed=0)
+
+    assert interval.estimate == pytest.approx(np.corrcoef(x, y)[0, 1])
+    assert interval.lower < interval.estimate < interval.upper
+    assert 0.3 < interval.lower and interval.upper < 0.7
+    assert interval.replicates.shape == (1000,)
+
+    # Small batches draw the replicates differently but agree on the
+    # interval
+    monkeypatch.setattr('src.question.bootstrap.MAX_BATCH_VALUES', 500 * 7)
+    batched = bootstrap_correlation(x, y, n_boot=1000, seed=0)
+    assert len(batched.replicates) == 1000
+    assert not np.isnan(batched.replicates).any()
+    assert batched.lower == pytest.approx(interval.lower, abs=0.02)
+    assert batched.upper == pytest.approx(interval.upper, abs=0.02)
+
+
+def test_garch_persistence_params():
+    """Test persistence from named model parameters."""
+    params = pd.Series({'mu': 0.1, 'omega': 0.05, 'alpha[1]': 0.1,
+                        'gamma[1]': 0.1, 'beta[1]': 0.8})
+    assert garch_persistence(params) == pytest.approx(0.95)
+
+
+def test_bootstrap_garch_persistence(correlated_returns):
+    """Test the persistence interval with in-process and pooled refits."""
+    returns = correlated_returns[0][:300]
+
+    serial = bootstrap_garch_persistence(returns, n_boot=8, seed=0, n_jobs=1)
+    pooled = bootstrap_garch_persistence(returns, n_boot=8, seed=0, n_jobs=2)
+
+    assert serial.replicates.shape == (8,)
+    assert np.allclose(serial.replicates, pooled.replicates, equal_nan=True)
+    assert serial.lower <= serial.upper
+
+
+def test_bootstrap_garch_persistence_reuses_fit(correlated_returns, mocker):
+    """Test warm-starting from an existing fit without refitting it."""
+    returns = correlated_returns[0][:300]
+    fit = arch_model(returns, p=1, q=1).fit(disp='off')
+    spy = mocker.spy(bootstrap, 'arch_model')
+
+    interval = bootstrap_garch_persistence(returns, n_boot=4, seed=0,
+                                           n_jobs=1, params=fit.params)
+
+    assert interval.estimate == pytest.approx(garch_persistence(fit.params))
+    assert spy.call_count == 4
+
+
+def test_bootstrap_garch_persistence_shared_pool(correlated_returns,
+                                                 monkeypatch):
+    """Test that default calls reuse one lazily created process pool."""
+    monkeypatch.setattr(bootstrap, 'POOL_WORKERS', 2)
+    monkeypatch.setattr(bootstrap, '_pool', None)
+    returns = correlated_returns[0][:300]
+
+    first = bootstrap_garch_persistence(returns, n_boot=4, seed=0,
+                                        chunk_size=2)
+    pool = bootstrap.shared_pool()
+    second = bootstrap_garch_persistence(returns, n_boot=4, seed=0,
+                                         chunk_size=2)
+    serial = bootstrap_garch_persistence(returns, n_boot=4, seed=0,
+                                         chunk_size=2, n_jobs=1)
+
+    assert bootstrap.shared_pool() is pool
+    assert np.allclose(first.replicates, second.replicates, equal_nan=True)
+    assert np.allclose(first.replicates, serial.replicates, equal_nan=True)
+    pool.shutdown()
@@ -8,7 +8,10 @@ import pandas as pd
 
 class MockAgg:
     """Mock class for polygon.io aggregates"""
-    def __init__(self, close, timestamp):
+    def __init__(self, close, timestamp, open=None, high=None, low=None):
+        self.open = close if open is None else open
+        self.high = close if high is None else high
+        self.low = close if low is None else low
         self.close = close
         self.timestamp = timestamp
 
@@ -40,16 +43,28 @@ def test_process_data_valid(data_fetcher, mock_aggs):
     assert isinstance(result.index, pd.DatetimeIndex)
 
 
+def test_process_data_ohlc(data_fetcher):
+    """Test that open, high and low prices are kept alongside close"""
+    aggs = [MockAgg(100.0, 1704067200000, open=99.5, high=100.5, low=99.0)]
+    result = data_fetcher.process_data(aggs)
+
+    assert list(result.columns) == ['Open', 'High', 'Low', 'Close']
+    assert result.iloc[0].tolist() == [99.5, 100.5, 99.0, 100.0]
+
+
 def test_get_data_multiple_tickers(data_fetcher, mock_aggs, mocker):
     """Test fetching data for multiple tickers"""
     tickers = ['AAPL', 'C:XAUUSD']
     mocker.patch.object(
         data_fetcher, 'fetch_aggregates', return_value=mock_aggs)
 
-    result = data_fetcher.get_data(tickers, days=30)
+    progress = []
+    result = data_fetcher.get_data(tickers, days=30,
+                                   on_progress=progress.append)
 
     assert isinstance(result, dict)
     assert set(result.keys()) == set(tickers)
+    assert progress == [0.5, 1.0]
     for ticker in tickers:
         assert isinstance(result[ticker], pd.DataFrame)
         assert not result[ticker].empty
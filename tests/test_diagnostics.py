@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import pytest
+from src.question.diagnostics import (
+    autocorrelation, jarque_bera, ljung_box, arch_lm, run_diagnostics,
+    SelectionRule
+)
+from src.question import multi_choice
+from src.question.multi_choice import GarchAnalysis
+import pandas as pd
+import numpy as np
+import scipy.stats
+from statsmodels.stats.diagnostic import acorr_ljungbox, het_arch
+
+
+@pytest.fixture
+def residuals():
+    """
+    Fixture providing i.i.d. normal residuals and residuals with
+    volatility clustering (simulated GARCH(1,1)).
+    """
+    rng = np.random.default_rng(69)
+    n = 2000
+    iid = rng.standard_normal(n)
+
+    clustered = np.empty(n)
+    var = 1.0
+    for t in range(n):
+        clustered[t] = np.sqrt(var) * rng.standard_normal()
+        var = 0.05 + 0.15 * clustered[t] ** 2 + 0.8 * var
+    return np.vstack([iid, clustered])
+
+
+def test_autocorrelation_fft_matches_direct(residuals):
+    """Test that the FFT and direct autocorrelations agree."""
+    direct = autocorrelation(residuals, 10, fft=False)
+    fft = autocorrelation(residuals, 10, fft=True)
+
+    assert direct.shape == (2, 10)
+    assert np.allclose(direct, fft)
+
+
+def test_tests_match_reference_implementations(residuals):
+    """Test the batched statistics against scipy and statsmodels."""
+    n = residuals.shape[1]
+    jb_stat, _ = jarque_bera(residuals)
+    lb_stat, lb_pvalue = ljung_box(autocorrelation(residuals, 10), n)
+    lm_stat, _ = arch_lm(residuals, 5)
+
+    for row, z in enumerate(residuals):
+        assert jb_stat[row] == pytest.approx(scipy.stats.jarque_bera(z)[0])
+        reference = acorr_ljungbox(z, lags=[10])
+        assert lb_stat[row] == pytest.approx(reference['lb_stat'].iloc[0])
+        assert lb_pvalue[row] == pytest.approx(
+            reference['lb_pvalue'].iloc[0])
+        assert lm_stat[row] == pytest.approx(het_arch(z, nlags=5)[0])
+
+
+def test_run_diagnostics_detects_clustering(residuals):
+    """Test that squared-residual tests flag volatility clustering."""
+    table = run_diagnostics(residuals, ['iid', 'garch'])
+
+    assert list(table.index) == ['iid', 'garch']
+    assert table.loc['garch', 'lb2_pvalue'] < 0.01
+    assert table.loc['garch', 'arch_lm_pvalue'] < 0.01
+    assert table.loc['iid', 'arch_lm_pvalue'] > 0.01
+    assert table.loc['iid', 'jb_pvalue'] > 0.01
+
+
+def test_selection_rule():
+    """Test selection among passing candidates and the fallback."""
+    table = pd.DataFrame({'lb2_pvalue': [0.01, 0.5, 0.3],
+                          'arch_lm_pvalue': [0.5, 0.5, 0.01]},
+                         index=['a', 'b', 'c'])
+    rule = SelectionRule(require=('lb2', 'arch_lm'))
+
+    assert rule.select(table, {'a': 1.0, 'b': 3.0, 'c': 2.0}) == 'b'
+    strict = SelectionRule(alpha=0.9, require=('lb2',))
+    assert strict.select(table, {'a': 1.0, 'b': 3.0, 'c': 2.0}) == 'a'
+
+    with pytest.raises(ValueError):
+        SelectionRule(require=('durbin_watson',))
+
+
+def test_select_best_model_reuses_search_fits(residuals, mocker):
+    """Test model selection over all fits from the parameter search."""
+    analyzer = GarchAnalysis()
+    log_ret = pd.Series(residuals[1][:500])
+    best_p, best_q, _, _, fits = analyzer.search_garch_params(log_ret)
+    spy = mocker.spy(multi_choice, 'arch_model')
+
+    name, model, table = analyzer.select_best_model(
+        log_ret, best_p, best_q, fits)
+
+    assert set(table.index) >= {f"GARCH({p}, {q})" for p, q in fits}
+    assert name in table.index
+    assert model.bic == pytest.approx(table.loc[name, 'bic'])
+    # Only the GJR-GARCH candidate is new; GARCH(best_p, best_q) is reused
+    assert all(call.kwargs.get('o') == 1 for call in spy.call_args_list)
+    assert spy.call_count == (1 if len(table) > len(fits) else 0)
@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import threading
+import pytest
+from src.question.jobs import JobManager, JobCancelled, report_progress
+
+
+@pytest.fixture
+def manager():
+    """Fixture providing a JobManager that is shut down after the test."""
+    manager = JobManager(max_workers=4)
+    yield manager
+    manager.shutdown()
+
+
+def test_dependencies_receive_results(manager):
+    """Test that dependent jobs get the result of the job they wait for."""
+    manager.new_request('s1')
+    manager.submit('s1', 'fetch', lambda: 2)
+    double = manager.submit('s1', 'double', lambda x: x * 2,
+                            depends_on=['fetch'])
+    add = manager.submit('s1', 'add', lambda x, y: x + y, 10,
+                         depends_on=['fetch'])
+
+    assert double.result(timeout=5) == 4
+    assert add.result(timeout=5) == 12
+
+
+def test_siblings_do_not_wait_for_each_other(manager):
+    """Test that a fast analysis finishes while a slow one still runs."""
+    release = threading.Event()
+    manager.new_request('s1')
+    manager.submit('s1', 'fetch', lambda: 'data')
+    slow = manager.submit('s1', 'slow', lambda data: release.wait(5),
+                          depends_on=['fetch'])
+    fast = manager.submit('s1', 'fast', lambda data: data.upper(),
+                          depends_on=['fetch'])
+
+    assert fast.result(timeout=5) == 'DATA'
+    assert not slow.done()
+    release.set()
+    assert slow.result(timeout=5) is True
+
+
+def test_failure_propagates(manager):
+    """Test that a failed fetch fails the jobs depending on it."""
+    def fail():
+        raise LookupError("no data")
+
+    manager.new_request('s1')
+    manager.submit('s1', 'fetch', fail)
+    child = manager.submit('s1', 'child', lambda data: data,
+                           depends_on=['fetch'])
+
+    with pytest.raises(LookupError):
+        child.result(timeout=5)
+
+
+def test_new_request_cancels_superseded_jobs(manager):
+    """Test that a newer request cancels running and pending jobs."""
+    started = threading.Event()
+
+    def long_job():
+        started.set()
+        while True:
+            report_progress(0.5)
+
+    manager.new_request('s1')
+    running = manager.submit('s1', 'fetch', long_job)
+    pending = manager.submit('s1', 'child', lambda data: data,
+                             depends_on=['fetch'])
+    other = manager.submit('s2', 'fetch', lambda: 'kept')
+    assert started.wait(5)
+
+    manager.new_request('s1')
+
+    with pytest.raises(JobCancelled):
+        running.result(timeout=5)
+    assert pending.done() and running.progress == 0.5
+    assert isinstance(pending.exception(), JobCancelled)
+    assert manager.jobs('s1') == {}
+    assert other.result(timeout=5) == 'kept'
+
+
+def test_idle_and_surplus_sessions_are_evicted(mocker):
+    """Test that old sessions are dropped together with their jobs."""
+    clock = mocker.patch('src.question.jobs.time.monotonic', return_value=0)
+    manager = JobManager(max_workers=1, max_sessions=2, session_ttl=60)
+    try:
+        for session_id in ['s1', 's2', 's3']:
+            manager.new_request(session_id)
+            manager.submit(session_id, 'fetch', lambda: 'data')
+        assert manager.jobs('s1') == {}
+        assert set(manager._sessions) == {'s2', 's3'}
+
+        clock.return_value = 30
+        assert 'fetch' in manager.jobs('s3')
+        clock.return_value = 80
+        manager.jobs('s3')
+        assert set(manager._sessions) == {'s3'}
+
+        manager.release('s3')
+        assert manager.jobs('s3') == {}
+    finally:
+        manager.shutdown()
+
+
+def test_checkpoints_stop_superseded_work(manager, monkeypatch):
+    """Test that bootstrap batches and simulation chunks are cancellable."""
+    from src.question.bootstrap import bootstrap_correlation
+    from src.question.simulation import simulate_returns
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    x, y = rng.standard_normal((2, 200))
+    std_resid = pd.Series(rng.standard_normal(200))
+    spec = {'mu': 0.0, 'omega': 1.0, 'alpha': [0.0], 'gamma': [],
+            'beta': [0.0], 'nu': None, 'eps': [0.0], 'sigma2': [1.0],
+            'std_resid': std_resid, 'scale': 1}
+    monkeypatch.setattr('src.question.bootstrap.MAX_BATCH_VALUES', 200 * 100)
+    progress = []
+
+    def checkpoint(fraction):
+        # Superseded right after the first checkpoint
+        progress.append(fraction)
+        report_progress(fraction)
+        manager.new_request('s1')
+
+    manager.new_request('s1')
+    boot = manager.submit('s1', 'boot', bootstrap_correlation, x, y,
+                          n_boot=1000, on_progress=checkpoint)
+    with pytest.raises(JobCancelled):
+        boot.result(timeout=5)
+    assert progress == [0.1, 0.2] and boot.progress == 0.2
+
+    progress.clear()
+    manager.new_request('s1')
+    sim = manager.submit('s1', 'risk', simulate_returns, [spec],
+                         n_paths=1000, horizon=5, chunk_size=100,
+                         on_progress=checkpoint)
+    with pytest.raises(JobCancelled):
+        sim.result(timeout=5)
+    assert progress == [0.1, 0.2]
@@ -82,3 +82,22 @@ def test_data_fetcher_date_range():
             assert date_range.days <= days, (
                 f"Date range {date_range.days} exceeds specified {days} days"
             )
+
+
+def test_correlation_excludes_overnight_gap():
+    """Test that the default calendar drops the overnight return."""
+    index = pd.DatetimeIndex(["2024-01-02 20:57", "2024-01-02 20:58",
+                              "2024-01-02 20:59", "2024-01-03 14:30",
+                              "2024-01-03 14:31", "2024-01-03 14:32"])
+    dataframes = {
+        'AAPL': pd.DataFrame({'Close': [100, 101, 100, 110, 111, 110.0]},
+                             index=index),
+        'C:XAUUSD': pd.DataFrame({'Close': [10, 11, 10, 11, 12, 11.0]},
+                                 index=index),
+    }
+    result = CorrelationAnalysis().compute_correlation(
+        dataframes, 'AAPL', 'C:XAUUSD', bootstrap_samples=0)
+
+    returns = result['aligned_data']['Log_Returns_AAPL']
+    assert pd.Timestamp("2024-01-03 14:30") not in returns.index
+    assert returns.abs().max() < 0.02
@@ -0,0 +1,229 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import pytest
+from src.question.text_input import DataFetcher
+from src.question.service import (
+    AnalysisService, make_server, main, parse_params, etag_matches
+)
+import pandas as pd
+import numpy as np
+
+
+class LocalAgg:
+    """Stand-in for a polygon.io aggregate bar"""
+    def __init__(self, open, high, low, close, timestamp):
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.timestamp = timestamp
+
+
+class LocalClient:
+    """
+    Stand-in for the Polygon REST client serving generated minute bars:
+    session hours for stocks, around the clock for C: tickers.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def list_aggs(self, ticker, multiplier, timespan, from_, to, limit):
+        self.calls += 1
+        if ticker.startswith("MISSING"):
+            return []
+        index = pd.date_range("2024-01-02", "2024-01-05", freq="min",
+                              inclusive="left")
+        if not ticker.startswith("C:"):
+            index = index[(index.hour * 60 + index.minute >= 14 * 60 + 30)
+                          & (index.hour < 21)]
+        rng = np.random.default_rng(sum(map(ord, ticker)))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, len(index))))
+        timestamps = index.to_numpy().astype("datetime64[ms]").astype(int)
+        return [LocalAgg(c, c * 1.0005, c * 0.9995, c, int(ts))
+                for c, ts in zip(close, timestamps)]
+
+
+@pytest.fixture
+def fetcher():
+    """Fixture providing a DataFetcher backed by the local client."""
+    fetcher = DataFetcher()
+    fetcher.client = LocalClient()
+    return fetcher
+
+
+@pytest.fixture
+def server(fetcher):
+    """Fixture running the HTTP service on a free local port."""
+    service = AnalysisService(fetcher=fetcher, max_workers=2, max_queue=2)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", service
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def get(url, headers=None):
+    """GET a URL, returning status, headers and decoded JSON body."""
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            status, response_headers = response.status, response.headers
+    except urllib.error.HTTPError as e:
+        body, status, response_headers = e.read(), e.code, e.headers
+    return status, response_headers, json.loads(body) if body else None
+
+
+def test_data_endpoint_columnar_and_etag(server):
+    """Test columnar data, result caching and If-None-Match."""
+    url, service = server
+    status, headers, body = get(f"{url}/data?tickers=aapl,C:XAUUSD&days=30")
+
+    assert status == 200
+    columns = body['data']['AAPL']['columns']
+    assert set(columns) == {'Open', 'High', 'Low', 'Close'}
+    assert len(columns['Close']) == len(body['data']['AAPL']['index']) \
+        == 3 * 390
+
+    calls = service.fetcher.client.calls
+    status, _, body = get(f"{url}/data?tickers=AAPL,C:XAUUSD&days=30",
+                          {'If-None-Match': headers['ETag']})
+    assert status == 304 and body is None
+    assert service.fetcher.client.calls == calls
+
+
+def test_analysis_endpoints(server):
+    """Test the correlation and volatility endpoints end to end."""
+    url, _ = server
+    status, _, corr = get(
+        f"{url}/correlation?ticker=AAPL&hedge=C:XAUUSD&days=30&bootstrap=200")
+    assert status == 200
+    assert -1 <= corr['correlation'] <= 1
+    assert corr['interval']['lower'] <= corr['interval']['upper']
+    assert 'Rolling_Correlation' in corr['series']['columns']
+
+    status, _, vol = get(f"{url}/volatility?ticker=AAPL&days=30")
+    assert status == 200
+    assert vol['model'] in vol['diagnostics']['index']
+    assert len(vol['conditional_volatility']['index']) == 3 * 390 - 1
+    assert 'Yang-Zhang' in vol['estimators']['columns']
+
+
+def test_errors(server):
+    """Test client errors and missing data."""
+    url, _ = server
+    assert get(f"{url}/correlation?days=30")[0] == 400
+    assert get(f"{url}/volatility?ticker=AAPL&days=abc")[0] == 400
+    assert get(f"{url}/volatility?ticker=MISSING")[0] == 404
+    assert get(f"{url}/unknown")[0] == 404
+    assert get(f"{url}/health")[2] == {'status': 'ok'}
+
+
+@pytest.mark.parametrize('endpoint, query', [
+    ('correlation', {'ticker': ['A'], 'bootstrap': ['-5']}),
+    ('correlation', {'ticker': ['A'], 'bootstrap': ['10001']}),
+    ('volatility', {'ticker': ['A'], 'persistence': ['1000000']}),
+])
+def test_parse_params_bounds(endpoint, query):
+    """Test that replicate and refit counts are bounded."""
+    with pytest.raises(ValueError):
+        parse_params(endpoint, query)
+
+
+def test_parse_params_allows_zero_samples():
+    """Test that bootstrap and persistence can be switched off."""
+    assert parse_params('correlation', {'ticker': ['A'], 'bootstrap': ['0']}
+                        )['bootstrap'] == 0
+    assert parse_params('volatility', {'ticker': ['A']})['persistence'] == 0
+
+
+def test_etag_matches():
+    """Test If-None-Match parsing of lists, weak tags and *."""
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches('"xabc", "abc2"', etag)
+    assert not etag_matches('', etag)
+
+
+def test_backpressure(fetcher):
+    """Test that requests beyond workers plus queue are rejected."""
+    release = threading.Event()
+    service = AnalysisService(fetcher=fetcher, max_workers=1, max_queue=0)
+    service.endpoints['data'] = lambda **params: release.wait(5)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        first = threading.Thread(target=get, args=(f"{url}/data?tickers=A",))
+        first.start()
+        while not service._in_flight:
+            time.sleep(0.01)
+        status, headers, _ = get(f"{url}/data?tickers=B")
+        assert status == 503 and headers['Retry-After'] == '1'
+        release.set()
+        first.join(5)
+        assert get(f"{url}/data?tickers=B")[0] == 200
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
+
+
+def test_concurrent_requests_share_fetches(fetcher, mocker):
+    """Test that overlapping analyses fetch each ticker only once."""
+    service = AnalysisService(fetcher=fetcher)
+    list_aggs = fetcher.client.list_aggs
+
+    def slow_list_aggs(**kwargs):
+        time.sleep(0.2)
+        return list_aggs(**kwargs)
+
+    calls = mocker.patch.object(fetcher.client, 'list_aggs',
+                                side_effect=slow_list_aggs)
+    threads = [
+        threading.Thread(target=service.dataframes,
+                         args=(['AAPL', 'C:XAUUSD'], 30)),
+        threading.Thread(target=service.dataframes, args=(['AAPL'], 30)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    tickers = [call.kwargs['ticker'] for call in calls.call_args_list]
+    assert sorted(tickers) == ['AAPL', 'C:XAUUSD']
+    service.shutdown()
+
+
+def test_cli(fetcher, mocker, capsys):
+    """Test the command line prints the analysis as JSON."""
+    mocker.patch('src.question.service.DataFetcher', return_value=fetcher)
+
+    assert main(['volatility', 'AAPL', '--days', '30', '--garch', '0']) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output['ticker'] == 'AAPL' and 'model' not in output
+
+    assert main(['data', 'MISSING']) == 1
+    capsys.readouterr()
+
+    assert main(['correlation', 'AAPL', '--days', '30',
+                 '--bootstrap', '0']) == 0
+    assert json.loads(capsys.readouterr().out)['interval'] is None
+
+    assert main(['volatility', 'AAPL', '--days', '30',
+                 '--persistence', '4']) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output['persistence']['samples'] == 4
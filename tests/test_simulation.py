@@ -0,0 +1,139 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import pytest
+from src.question.simulation import (
+    spec_from_fit, simulate_returns, portfolio_returns, value_at_risk,
+    joint_residuals
+)
+from src.question.alignment import US_EQUITIES
+from src.question.multi_choice import GarchAnalysis, RiskAnalysis
+import pandas as pd
+import numpy as np
+from scipy.stats import norm
+from arch import arch_model
+
+
+@pytest.fixture
+def returns():
+    """Fixture providing minute returns for a stock and a hedge."""
+    rng = np.random.default_rng(69)
+    index = pd.date_range("2024-01-02 14:30", periods=1000, freq="min")
+    base = rng.standard_normal(1000)
+    return pd.DataFrame({'stock': base + rng.standard_normal(1000),
+                         'hedge': base + rng.standard_normal(1000)},
+                        index=index)
+
+
+def constant_spec(omega, index, scale=1):
+    """Spec of a model with constant variance omega and no mean."""
+    return {'mu': 0.0, 'omega': omega, 'alpha': [0.0], 'gamma': [],
+            'beta': [0.0], 'nu': None, 'eps': [0.0], 'sigma2': [omega],
+            'std_resid': pd.Series(np.random.default_rng(1).standard_normal(
+                len(index)), index=index),
+            'scale': scale}
+
+
+@pytest.mark.parametrize('innovations', ['normal', 't'])
+def test_constant_variance_paths(returns, innovations):
+    """Test that cumulative returns have the analytic variance."""
+    spec = constant_spec(4.0, returns.index, scale=10)
+    simulated = simulate_returns([spec], n_paths=40_000, horizon=25,
+                                 innovations=innovations, seed=0,
+                                 chunk_size=7_000)
+
+    assert simulated.shape == (40_000, 1)
+    # 25 steps of variance 4, scaled down by 10
+    assert simulated.std() == pytest.approx(np.sqrt(25 * 4.0) / 10, rel=0.03)
+
+
+def test_reproducible_and_pool_independent(returns):
+    """Test seeding and that a process pool gives the same paths."""
+    fits = [arch_model(returns[col], p=1, q=1).fit(disp='off')
+            for col in returns]
+    specs = [spec_from_fit(fit) for fit in fits]
+
+    serial = simulate_returns(specs, n_paths=3_000, horizon=10, seed=7,
+                              chunk_size=1_000)
+    again = simulate_returns(specs, n_paths=3_000, horizon=10, seed=7,
+                             chunk_size=1_000)
+    pooled = simulate_returns(specs, n_paths=3_000, horizon=10, seed=7,
+                              chunk_size=1_000, n_jobs=2)
+
+    assert np.array_equal(serial, again)
+    assert np.allclose(serial, pooled)
+    # Jointly resampled residuals keep the assets correlated
+    assert np.corrcoef(serial.T)[0, 1] > 0.2
+
+
+def test_mixed_model_orders(returns):
+    """Test simulating a GJR-GARCH(2, 1) next to a GARCH(1, 1)."""
+    gjr = arch_model(returns['stock'], p=2, o=1, q=1, dist='t').fit(
+        disp='off')
+    garch = arch_model(returns['hedge'], p=1, q=1).fit(disp='off')
+    specs = [spec_from_fit(gjr, 1000), spec_from_fit(garch, 1000)]
+
+    assert specs[0]['nu'] is not None and len(specs[0]['alpha']) == 2
+    simulated = simulate_returns(specs, n_paths=2_000, horizon=5,
+                                 innovations='t', seed=0)
+    assert np.isfinite(simulated).all()
+
+
+def test_joint_residuals_asof_without_session_openers():
+    """
+    Test that hedge residuals off the stock's exact timestamps are still
+    paired as-of, and that session-opening rows are left out.
+    """
+    stock_index = US_EQUITIES.minute_index("2024-01-02", "2024-01-04")
+    hedge_index = pd.date_range("2024-01-02", "2024-01-04", freq="min") \
+        + pd.Timedelta(seconds=30)
+    stock = pd.Series(np.arange(len(stock_index), dtype=float),
+                      index=stock_index)
+    hedge = pd.Series(np.arange(len(hedge_index), dtype=float),
+                      index=hedge_index)
+    specs = [{'std_resid': stock}, {'std_resid': hedge}]
+
+    assert pd.concat([stock, hedge], axis=1, join='inner').empty
+    rows = joint_residuals(specs, calendar=US_EQUITIES)
+
+    # Two sessions of 390 bars, without each session's first bar
+    assert rows.shape == (2 * 389, 2)
+    assert 0 not in rows[:, 0] and 390 not in rows[:, 0]
+    # The hedge value is the bar 30 seconds before each stock minute
+    expected = hedge.asof(stock_index[rows[:, 0].astype(int)])
+    assert np.array_equal(rows[:, 1], expected.to_numpy())
+
+
+def test_value_at_risk_normal():
+    """Test VaR and ES against normal closed forms."""
+    sample = np.random.default_rng(0).normal(0, 0.01, 1_000_000)
+    var, es = value_at_risk(sample, level=0.99)
+
+    assert var == pytest.approx(0.01 * norm.ppf(0.99), rel=0.01)
+    assert es == pytest.approx(0.01 * norm.pdf(norm.ppf(0.99)) / 0.01,
+                               rel=0.01)
+    assert portfolio_returns(np.log([[1.1, 0.9]]), [0.5, 0.5])[0] == \
+        pytest.approx(0.0)
+
+
+def test_compute_risk(returns):
+    """Test the risk analysis on top of the volatility analysis."""
+    prices = 100 * np.exp(returns.cumsum() / 1000)
+    dataframes = {'AAPL': prices[['stock']].rename(columns={'stock': 'Close'}),
+                  'C:XAUUSD': prices[['hedge']].rename(
+                      columns={'hedge': 'Close'})}
+    volatility = GarchAnalysis().fit_volatility(dataframes['AAPL'])
+
+    result = RiskAnalysis().compute_risk(
+        dataframes, volatility, 'AAPL', 'C:XAUUSD', horizon=10,
+        n_paths=5_000)
+
+    assert list(result['risk'].index) == ['AAPL', 'Portfolio']
+    assert (result['risk']['ES'] >= result['risk']['VaR']).all()
+    # Diversification lowers the risk of the portfolio
+    assert result['risk'].loc['Portfolio', 'VaR'] < \
+        result['risk'].loc['AAPL', 'VaR']
+
+    volatility['best_model'] = None
+    assert RiskAnalysis().compute_risk(
+        dataframes, volatility, 'AAPL', 'C:XAUUSD') is None
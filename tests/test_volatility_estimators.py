@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent)) # ChatGPT
+import pytest
+from src.question.volatility_estimators import (
+    daily_ohlc, realized_variance, parkinson, garman_klass,
+    rogers_satchell, yang_zhang, estimate_volatility, RANGE_ESTIMATORS
+)
+import pandas as pd
+import numpy as np
+
+
+@pytest.fixture
+def intraday_data():
+    """
+    Fixture providing five days of minute bars with OHLC prices.
+    """
+    np.random.seed(69)
+    days = pd.date_range(start="2024-01-01 14:30", periods=5, freq="D")
+    timestamps = days.repeat(60) + pd.to_timedelta(
+        np.tile(np.arange(60), 5), unit="min")
+
+    close = 100 * np.exp(np.cumsum(np.random.normal(0, 0.001, 300)))
+    open_ = np.r_[100.0, close[:-1]]
+    spread = np.abs(np.random.normal(0, 0.0005, 300))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low,
+                         'Close': close}, index=timestamps)
+
+
+def test_daily_ohlc(intraday_data):
+    """Test aggregation of minute bars to daily OHLC."""
+    daily = daily_ohlc(intraday_data.index, intraday_data['Open'],
+                       intraday_data['High'], intraday_data['Low'],
+                       intraday_data['Close'])
+    grouped = intraday_data.groupby(intraday_data.index.normalize())
+
+    assert len(daily) == 5
+    assert np.allclose(daily['Open'], grouped['Open'].first())
+    assert np.allclose(daily['High'], grouped['High'].max())
+    assert np.allclose(daily['Low'], grouped['Low'].min())
+    assert np.allclose(daily['Close'], grouped['Close'].last())
+    assert (daily['Bars'] == 60).all()
+
+
+def test_realized_variance_excludes_overnight(intraday_data):
+    """Test that realized variance sums squared returns within each day."""
+    rv = realized_variance(intraday_data.index, intraday_data['Close'])
+
+    log_ret = np.log(intraday_data['Close']).diff()
+    day = intraday_data.index.normalize()
+    log_ret[day != np.r_[day[:1], day[:-1]]] = np.nan
+    expected = (log_ret ** 2).groupby(day).sum()
+
+    assert np.allclose(rv.to_numpy(), expected.to_numpy())
+
+
+def test_days_follow_extended_hours_sessions():
+    """
+    Test that EST extended-hours bars (04:00-20:00 ET, i.e. up to 00:59
+    UTC the next day) are grouped by exchange session, not UTC date.
+    """
+    sessions = pd.date_range("2024-01-08 09:00", periods=5, freq="D")
+    timestamps = sessions.repeat(960) + pd.to_timedelta(
+        np.tile(np.arange(960), 5), unit="min")
+    # Flat within each session, +1% at every open
+    close = np.repeat(100 * 1.01 ** np.arange(5), 960)
+    data = pd.DataFrame({'Open': close, 'High': close, 'Low': close,
+                         'Close': close}, index=timestamps)
+
+    rv = realized_variance(data.index, data['Close'])
+    daily = daily_ohlc(data.index, data['Open'], data['High'], data['Low'],
+                       data['Close'])
+
+    expected_days = pd.date_range("2024-01-08", periods=5, freq="D")
+    assert list(rv.index) == list(expected_days)
+    assert np.allclose(rv, 0.0)
+    assert list(daily.index) == list(expected_days)
+    assert np.allclose(daily['Open'], 100 * 1.01 ** np.arange(5))
+    assert (daily['Bars'] == 960).all()
+
+
+def test_range_estimators_match_formulas():
+    """Test range estimators against their textbook formulas."""
+    o, h, l, c = 100.0, 103.0, 98.0, 101.0
+    hl, co = np.log(h / l), np.log(c / o)
+
+    assert parkinson([h], [l])[0] == pytest.approx(
+        hl ** 2 / (4 * np.log(2)))
+    assert garman_klass([o], [h], [l], [c])[0] == pytest.approx(
+        0.5 * hl ** 2 - (2 * np.log(2) - 1) * co ** 2)
+    assert rogers_satchell([o], [h], [l], [c])[0] == pytest.approx(
+        np.log(h / c) * np.log(h / o) + np.log(l / c) * np.log(l / o))
+
+
+def test_rolling_window_matches_pandas(intraday_data):
+    """Test that rolling estimators agree with a pandas rolling mean."""
+    high, low = intraday_data['High'], intraday_data['Low']
+    daily = parkinson(high, low)
+    rolled = parkinson(high, low, window=10)
+
+    expected = pd.Series(daily).rolling(10).mean().to_numpy()
+    assert np.allclose(rolled, expected, equal_nan=True)
+
+    with pytest.raises(ValueError):
+        yang_zhang(high, high, low, low, window=1)
+
+
+def test_estimate_volatility(intraday_data):
+    """Test that all estimators are produced for OHLC data."""
+    estimates = estimate_volatility(intraday_data, window=2)
+
+    assert list(estimates.columns) == ['Realized', *RANGE_ESTIMATORS]
+    assert len(estimates) == 5
+    assert (estimates.iloc[2:] > 0).all().all()
+
+    close_only = estimate_volatility(intraday_data[['Close']], window=2)
+    assert list(close_only.columns) == ['Realized']